@@ -0,0 +1,152 @@
+"""One timer for every animation in a Tk interpreter.
+
+Animations (GIF labels, the startup rocket) register a step callback and an
+interval with the clock of their Tk root instead of each running its own
+`after` chain. A single `after` timer fires at the next due animation.
+Animations whose widget has been destroyed are dropped. Animations whose
+widget is not viewable (hidden, withdrawn or minimized window) are skipped,
+and if nothing is visible the clock only polls every IDLE_POLL_MS.
+"""
+import time
+import tkinter as tk
+from collections import deque
+
+IDLE_POLL_MS = 250
+
+_clocks = {}   # Tk root -> AnimationClock
+
+
+class _Animation:
+    __slots__ = ('widget', 'step', 'interval', 'due')
+
+    def __init__(self, widget, step, interval, due):
+        self.widget = widget
+        self.step = step
+        self.interval = interval
+        self.due = due
+
+
+class AnimationClock:
+    def __init__(self, root):
+        self.root = root
+        self._animations = {}
+        self._next_handle = 1
+        self._after_id = None
+        self._wake_at = None
+        root.bind("<Destroy>", self._on_destroy, add="+")
+
+    def add(self, widget, step, interval_ms, delay_ms=None):
+        """Call step() every `interval_ms` while `widget` is viewable; returns a handle.
+
+        step() may return False to end the animation.
+        """
+        handle = self._next_handle
+        self._next_handle += 1
+        first = interval_ms if delay_ms is None else delay_ms
+        self._animations[handle] = _Animation(widget, step, interval_ms / 1000,
+                                              time.monotonic() + first / 1000)
+        self._schedule(first)
+        return handle
+
+    def remove(self, handle):
+        self._animations.pop(handle, None)
+
+    def active_count(self):
+        return len(self._animations)
+
+    def _schedule(self, delay_ms):
+        wake_at = time.monotonic() + delay_ms / 1000
+        if self._after_id is not None:
+            if self._wake_at <= wake_at:
+                return
+            self.root.after_cancel(self._after_id)
+        self._wake_at = wake_at
+        self._after_id = self.root.after(max(1, int(delay_ms)), self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        now = time.monotonic()
+        next_due = None
+        for handle, anim in list(self._animations.items()):
+            try:
+                if not anim.widget.winfo_exists():
+                    raise tk.TclError("destroyed")
+                if not anim.widget.winfo_viewable():
+                    continue  # paused while hidden
+                if now >= anim.due:
+                    if anim.step() is False:
+                        raise tk.TclError("finished")
+                    # Skip ticks missed under load instead of replaying them in a burst
+                    anim.due = max(anim.due + anim.interval, now)
+            except tk.TclError:
+                self._animations.pop(handle, None)
+                continue
+            next_due = anim.due if next_due is None else min(next_due, anim.due)
+        if not self._animations:
+            return
+        if next_due is None:
+            self._schedule(IDLE_POLL_MS)
+        else:
+            self._schedule(max(1.0, (next_due - time.monotonic()) * 1000))
+
+    def _on_destroy(self, event):
+        if event.widget is self.root:
+            self._animations.clear()
+            _clocks.pop(self.root, None)
+
+
+class FrameStats:
+    """Rolling frame-interval statistics for one animation.
+
+    Gaps longer than `max_gap` seconds are treated as pauses (hidden window)
+    and left out of the statistics.
+    """
+
+    def __init__(self, target_fps, max_gap=0.25, window=600):
+        self.target = 1.0 / target_fps
+        self.max_gap = max_gap
+        self.intervals = deque(maxlen=window)
+        self.frames = 0
+        self.skipped = 0
+        self._last = None
+
+    def record(self, now):
+        """Log a frame shown at `now`; seconds since the previous one (0 after a pause)."""
+        dt = 0.0 if self._last is None else now - self._last
+        self._last = now
+        self.frames += 1
+        if dt > self.max_gap:
+            return 0.0
+        if dt:
+            self.intervals.append(dt)
+            self.skipped += max(0, round(dt / self.target) - 1)
+        return dt
+
+    def summary(self):
+        if not self.intervals:
+            return {'frames': self.frames, 'fps': 0.0, 'mean_ms': 0.0, 'p95_ms': 0.0,
+                    'max_ms': 0.0, 'skipped': self.skipped}
+        ordered = sorted(self.intervals)
+        mean = sum(ordered) / len(ordered)
+        return {
+            'frames': self.frames,
+            'fps': 1.0 / mean,
+            'mean_ms': mean * 1000,
+            'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            'max_ms': ordered[-1] * 1000,
+            'skipped': self.skipped,
+        }
+
+
+def clock_for(widget):
+    """The shared clock of `widget`'s Tk root."""
+    root = widget._root()
+    clock = _clocks.get(root)
+    if clock is None:
+        clock = _clocks[root] = AnimationClock(root)
+    return clock
+
+
+def active_animations():
+    """Number of registered animations across all live Tk roots."""
+    return sum(clock.active_count() for clock in _clocks.values())
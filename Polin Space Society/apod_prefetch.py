@@ -0,0 +1,95 @@
+"""Prefetch queue of random Astronomy Pictures of the Day.
+
+Keeps the next few random *image* APOD entries (many dates are videos)
+downloaded and scaled in the background, so "Generate New Image" can show
+one immediately. pop() hands out a ready entry and tops the queue up again
+on the shared NASA worker pool. When nothing is ready yet it returns a
+Future for the next entry the refill downloads, so a first click does not
+start a download of its own next to the refill's.
+"""
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime
+
+import nasa_client
+from image_cache import load_image
+
+APOD_URL = "https://api.nasa.gov/planetary/apod"
+FIRST_APOD = datetime(2015, 1, 1)
+PREFETCH_DEPTH = 3
+MAX_TRIES = 6     # random dates to try per entry before giving up
+
+
+def random_apod_date(rng=random):
+    start, end = FIRST_APOD, datetime.now()
+    return (start + (end - start) * rng.random()).strftime("%Y-%m-%d")
+
+
+class ApodPrefetcher:
+    def __init__(self, api_key, size=(900, 700), depth=PREFETCH_DEPTH):
+        self.api_key = api_key
+        self.size = size
+        self.depth = depth
+        self._ready = deque()     # (apod metadata, scaled PIL image)
+        self._waiters = deque()   # Futures handed out by pop() while nothing was ready
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def fetch_one(self):
+        """Download one random image-type APOD entry; blocks. (data, image) or None."""
+        for _ in range(MAX_TRIES):
+            data = nasa_client.get_json(APOD_URL, {"api_key": self.api_key, "date": random_apod_date()})
+            if data.get("media_type") == "image" and data.get("url"):
+                return data, load_image(data["url"], self.size)
+        return None
+
+    def _worker(self):
+        try:
+            entry = self.fetch_one()
+        except Exception as e:
+            print(f"APOD prefetch failed: {e}")
+            entry = None
+        with self._lock:
+            self._in_flight -= 1
+            waiter = None
+            while self._waiters and waiter is None:
+                waiter = self._waiters.popleft()
+                if not waiter.set_running_or_notify_cancel():
+                    waiter = None   # the caller stopped waiting
+            if entry is not None and waiter is None:
+                self._ready.append(entry)
+        if waiter is not None:
+            waiter.set_result(entry)   # None after a failed fetch
+        # A failed slot is retried on the next pop(), so an outage does not spin
+        if entry is not None:
+            self.refill()
+
+    def refill(self):
+        with self._lock:
+            wanted = max(self.depth, len(self._waiters))
+            missing = max(0, wanted - len(self._ready) - self._in_flight)
+            self._in_flight += missing
+        for _ in range(missing):
+            nasa_client.executor().submit(self._worker)
+
+    def pop(self):
+        """Next ready (data, image), or a Future of the next download when none is ready.
+
+        The Future resolves to (data, image), or None if that download
+        failed; cancel it to leave the entry in the queue.
+        """
+        with self._lock:
+            if self._ready:
+                entry = self._ready.popleft()
+            else:
+                entry = Future()
+                self._waiters = deque(w for w in self._waiters if not w.cancelled())
+                self._waiters.append(entry)
+        self.refill()
+        return entry
+
+    def ready(self):
+        with self._lock:
+            return len(self._ready)
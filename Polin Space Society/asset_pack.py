@@ -0,0 +1,226 @@
+"""Prebuilt pack of pre-scaled UI imagery.
+
+`python asset_pack.py build` renders every sprite at the sizes the UI uses
+(the 300x300 rocket, the destination and astronaut GIFs as frame strips at
+100 and 90 px, and the startup background for common window sizes) into
+one indexed file next to the sources. At runtime the pack is memory-mapped:
+sprites are stored raw and wrapped by Image.frombuffer without copying or
+resampling, and the large backgrounds are stored zlib-compressed and only
+inflated. Each source is fingerprinted (size + CRC32); entries for a source
+that has changed since the build are ignored, and callers fall back to the
+source files.
+
+Layout: 8-byte magic, u64 index offset, u64 index length, 64-byte aligned
+blobs, then a JSON index.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+from PIL import Image
+
+MAGIC = b"PLNPACK1"
+HEADER = struct.Struct("<8sQQ")
+ALIGN = 64
+PACK_FILE = "ui_assets.pack"
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BACKGROUND = "Frame 23@2x.png"
+ROCKET = "Rocket.png"
+ROCKET_SIZES = [(300, 300)]
+GIF_SIZES = {
+    "OuterSpace.gif": [(100, 100), (90, 90)],
+    "Moon.gif": [(100, 100), (90, 90)],
+    "MARS.gif": [(100, 100), (90, 90)],
+    "astro walking FINAL.gif": [(100, 100)],
+}
+BACKGROUND_WINDOWS = [(1280, 720), (1366, 768), (1536, 864), (1920, 1080)]
+
+
+def background_size(source_size, width, height):
+    """Scaled size of the startup background covering a width x height canvas."""
+    original_width, original_height = source_size
+    scale = max(width / original_width, height / original_height)
+    return int(original_width * scale) + 2, int(original_height * scale)
+
+
+def _fingerprint(path):
+    crc = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            crc = zlib.crc32(block, crc)
+    return {"size": os.path.getsize(path), "crc32": crc}
+
+
+# =========================
+# READING
+# =========================
+class AssetPack:
+    def __init__(self, path, directory=None):
+        self.path = path
+        self.directory = directory or os.path.dirname(os.path.abspath(path))
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, offset, length = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not an asset pack")
+            index = json.loads(bytes(self._map[offset:offset + length]))
+        except Exception:
+            self._file.close()
+            raise
+        self.sources = index["sources"]
+        self.entries = index["entries"]
+        self._valid = {}
+        self._lock = threading.Lock()
+
+    def _source_ok(self, name):
+        with self._lock:
+            ok = self._valid.get(name)
+            if ok is None:
+                recorded = self.sources.get(name) or {}
+                try:
+                    current = _fingerprint(os.path.join(self.directory, name))
+                    ok = all(recorded.get(k) == v for k, v in current.items())
+                except OSError:
+                    ok = False
+                self._valid[name] = ok
+            return ok
+
+    def image(self, key):
+        """PIL image for `key`, or None if missing or built from an outdated source."""
+        entry = self.entries.get(key)
+        if entry is None or not self._source_ok(entry["source"]):
+            return None
+        size = (entry["width"], entry["height"])
+        view = memoryview(self._map)[entry["offset"]:entry["offset"] + entry["length"]]
+        if entry["codec"] == "zlib":
+            return Image.frombytes(entry["mode"], size, zlib.decompress(view))
+        return Image.frombuffer(entry["mode"], size, view, "raw", entry["mode"], 0, 1)
+
+    def source_size(self, name):
+        """(width, height) of a source image as recorded at build time."""
+        info = self.sources.get(name)
+        return tuple(info["dimensions"]) if info and self._source_ok(name) else None
+
+    def background(self, size):
+        return self.image(f"background/{size[0]}x{size[1]}")
+
+    def rocket(self, size):
+        return self.image(f"rocket/{size[0]}x{size[1]}")
+
+    def gif_strip(self, name, size):
+        """(horizontal strip of frames, frame count) or None."""
+        key = f"gif/{name}/{size[0]}x{size[1]}"
+        img = self.image(key)
+        return (img, self.entries[key]["frames"]) if img is not None else None
+
+
+_default = None
+_default_loaded = False
+_default_lock = threading.Lock()
+
+
+def default_pack():
+    """The pack next to the UI sources, or None when it has not been built."""
+    global _default, _default_loaded
+    with _default_lock:
+        if not _default_loaded:
+            _default_loaded = True
+            path = os.path.join(ASSET_DIR, PACK_FILE)
+            if os.path.exists(path):
+                try:
+                    _default = AssetPack(path, ASSET_DIR)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Ignoring asset pack {path}: {e}")
+        return _default
+
+
+# =========================
+# BUILDING
+# =========================
+def _gif_strip(path, size):
+    with Image.open(path) as gif:
+        count = getattr(gif, "n_frames", 1)
+        strip = Image.new("RGBA", (size[0] * count, size[1]))
+        for i in range(count):
+            gif.seek(i)
+            strip.paste(gif.convert("RGBA").resize(size, Image.Resampling.LANCZOS), (i * size[0], 0))
+    return strip, count
+
+
+def build(directory=ASSET_DIR, out_path=None):
+    """Render every UI sprite and background into one pack file; returns its path."""
+    out_path = out_path or os.path.join(directory, PACK_FILE)
+    sources = {}
+    images = []   # (key, source, image, codec, extra)
+
+    def source(name):
+        info = _fingerprint(os.path.join(directory, name))
+        with Image.open(os.path.join(directory, name)) as img:
+            info["dimensions"] = list(img.size)
+        sources[name] = info
+        return os.path.join(directory, name)
+
+    with Image.open(source(BACKGROUND)) as bg:
+        bg.load()
+        opaque = bg.mode != "RGBA" or bg.getextrema()[3][0] == 255
+        bg = bg.convert("RGB" if opaque else "RGBA")
+        for window in BACKGROUND_WINDOWS:
+            size = background_size(bg.size, *window)
+            images.append((f"background/{size[0]}x{size[1]}", BACKGROUND,
+                           bg.resize(size, Image.Resampling.LANCZOS), "zlib", {}))
+    with Image.open(source(ROCKET)) as rocket:
+        for size in ROCKET_SIZES:
+            # same filter as the runtime fallback: Image.resize's default
+            images.append((f"rocket/{size[0]}x{size[1]}", ROCKET,
+                           rocket.convert("RGBA").resize(size), "raw", {}))
+    for name, sizes in GIF_SIZES.items():
+        path = source(name)
+        for size in sizes:
+            strip, count = _gif_strip(path, size)
+            images.append((f"gif/{name}/{size[0]}x{size[1]}", name, strip, "raw", {"frames": count}))
+
+    entries = {}
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+        for key, src, img, codec, extra in images:
+            data = img.tobytes()
+            if codec == "zlib":
+                data = zlib.compress(data, 6)
+            f.write(b"\0" * (-f.tell() % ALIGN))
+            entries[key] = dict(offset=f.tell(), length=len(data), width=img.width, height=img.height,
+                                mode=img.mode, codec=codec, source=src, **extra)
+            f.write(data)
+        index = json.dumps({"sources": sources, "entries": entries}).encode()
+        offset = f.tell()
+        f.write(index)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, offset, len(index)))
+    os.replace(tmp, out_path)
+    return out_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the pre-scaled UI asset pack.")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--dir", default=ASSET_DIR, help="directory with the source images")
+    args = parser.parse_args(argv)
+    path = os.path.join(args.dir, PACK_FILE)
+    if args.command == "build":
+        path = build(args.dir)
+        print(f"Wrote {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    pack = AssetPack(path, args.dir)
+    for key, e in pack.entries.items():
+        state = "ok" if pack._source_ok(e["source"]) else "stale"
+        print(f"{key:<40} {e['width']:>5}x{e['height']:<5} {e['mode']:<5} {e['codec']:<5} "
+              f"{e['length'] / 1024:9.1f} KB  {state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Headless validation and reports for a directory of saved designs.
+
+Accepts every format the app writes: the designer's "Export JSON"
+({'habitat', 'modules', 'statistics'}) or binary .plnd export
+(design_binary.py), and the wizard's "Save Design JSON" (flat name / shape
+/ length / width / height / crew_size / mission_days).
+Each file is checked against its schema, loaded into a HabitatModel and
+validated exactly like the designer does (including layout checks for placed
+modules). Designer exports whose stored statistics no longer match the
+recomputed ones are flagged. Optionally a PDF and/or JSON report is
+written per design. Files are spread over a process pool; the summary is
+JSON with per-file timings.
+
+    python design_batch.py designs/ --pdf reports/ --summary summary.json
+"""
+import argparse
+import glob
+import json
+import math
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from design_binary import BINARY_EXT, load_design
+from habitat_model import NASA_MODULES, HabitatModel, compute_volume, DAYS_PER_MONTH
+
+HABITAT_SHAPES = ['cylindrical', 'spherical', 'dome', 'modular']
+MODULE_SHAPES = ['cube', 'sphere', 'cylinder', 'hexagonal', 'triangle']
+STATS_TOLERANCE = 1e-6   # relative, for stored vs recomputed statistics
+CHUNK_FILES = 16
+
+
+# =========================
+# FORMATS
+# =========================
+def detect_format(data):
+    """'designer' or 'wizard'; raises ValueError for anything else."""
+    if not isinstance(data, dict):
+        raise ValueError("top level is not a JSON object")
+    if 'habitat' in data or 'modules' in data:
+        return 'designer'
+    if 'mission_days' in data or 'habitat_type' in data:
+        return 'wizard'
+    raise ValueError("neither a designer export nor a wizard save")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _check_fields(data, numbers, integers, where):
+    errors = []
+    for key in numbers:
+        if key in data and not (_is_number(data[key]) and data[key] > 0):
+            errors.append(f"{where}{key} must be a positive number, got {data[key]!r}")
+    for key in integers:
+        if key in data and not (_is_number(data[key]) and data[key] >= 1 and data[key] == int(data[key])):
+            errors.append(f"{where}{key} must be a positive integer, got {data[key]!r}")
+    return errors
+
+
+def schema_errors(fmt, data):
+    """Structural problems that stop a file from loading the way the app would."""
+    if fmt == 'wizard':
+        errors = [f"missing {key}" for key in ('shape', 'length', 'width', 'height', 'crew_size', 'mission_days')
+                  if key not in data]
+        errors += _check_fields(data, ('length', 'width', 'height'), ('crew_size', 'mission_days'), "")
+        if 'shape' in data and data['shape'] not in HABITAT_SHAPES:
+            errors.append(f"unknown habitat shape {data['shape']!r}")
+        return errors
+
+    errors = []
+    habitat = data.get('habitat', {})
+    modules = data.get('modules', [])
+    if not isinstance(habitat, dict):
+        return ["habitat is not an object"]
+    if not isinstance(modules, list):
+        return ["modules is not a list"]
+    errors += _check_fields(habitat, ('length', 'diameter', 'height'), ('crew_size', 'mission_duration'),
+                            "habitat.")
+    if 'shape' in habitat and habitat['shape'] not in HABITAT_SHAPES:
+        errors.append(f"unknown habitat shape {habitat['shape']!r}")
+    for i, module in enumerate(modules):
+        where = f"modules[{i}]."
+        if not isinstance(module, dict):
+            errors.append(f"modules[{i}] is not an object")
+            continue
+        name = module.get('name')
+        if not isinstance(name, str) or name not in NASA_MODULES:
+            errors.append(f"{where}name: unknown module {module.get('name')!r}")
+        if module.get('shape', 'cube') not in MODULE_SHAPES:
+            errors.append(f"{where}shape: unknown module shape {module.get('shape')!r}")
+        params = module.get('params', {})
+        if not isinstance(params, dict) or not all(_is_number(v) and v >= 0 for v in params.values()):
+            errors.append(f"{where}params must map to non-negative numbers")
+        errors += _check_fields(module, (), ('count',), where)
+        for key in ('x', 'y'):
+            if key in module and not _is_number(module[key]):
+                errors.append(f"{where}{key} must be a number, got {module[key]!r}")
+    return errors
+
+
+def wizard_to_model(data):
+    """HabitatModel for a wizard save, mapped like the wizard's apply_to_global()."""
+    config = {
+        'shape': data['shape'],
+        'length': float(data['length']),
+        'diameter': float(data['width']),
+        'height': float(data['height']),
+        'crew_size': int(data['crew_size']),
+        'mission_duration': int(max(1, data['mission_days'] // DAYS_PER_MONTH)),
+    }
+    if data.get('destination'):
+        config['location'] = data['destination']
+    return HabitatModel(config)
+
+
+def _stale_statistics(stored, current, prefix=""):
+    # Paths of stored numbers that differ from the recomputed statistics
+    stale = []
+    for key, value in stored.items():
+        if isinstance(value, dict) and isinstance(current.get(key), dict):
+            stale += _stale_statistics(value, current[key], f"{prefix}{key}.")
+        elif key in current and not (_is_number(value) and
+                                     math.isclose(value, current[key], rel_tol=STATS_TOLERANCE, abs_tol=1e-9)):
+            stale.append(f"{prefix}{key}")
+    return stale
+
+
+# =========================
+# REPORTS
+# =========================
+def design_pdf(model, location):
+    """FPDF document with the designer's "Export PDF" report for `model`."""
+    from fpdf import FPDF
+    config = model.config
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, f"NASA Habitat Design - {location}", ln=True, align="C")
+    pdf.set_font("Arial", size=12)
+    pdf.ln(10)
+
+    pdf.cell(0, 10, "Habitat Configuration", ln=True)
+    pdf.cell(0, 10, f"Shape: {config['shape'].capitalize()}", ln=True)
+    pdf.cell(0, 10, f"Length: {config['length']:.1f} m", ln=True)
+    pdf.cell(0, 10, f"Diameter: {config['diameter']:.1f} m", ln=True)
+    pdf.cell(0, 10, f"Height: {config['height']:.1f} m", ln=True)
+    pdf.cell(0, 10, f"Crew Size: {config['crew_size']}", ln=True)
+    pdf.cell(0, 10, f"Mission Duration: {config['mission_duration']} months", ln=True)
+
+    pdf.ln(10)
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 10, "Statistics", ln=True)
+    pdf.set_font("Arial", size=12)
+    stats = model.gas_stats()
+    pdf.cell(0, 10, f"Total Volume: {model.habitat_volume():.1f} m³", ln=True)
+    pdf.cell(0, 10, f"Used Volume: {model.used_volume():.1f} m³", ln=True)
+    pdf.cell(0, 10, f"Utilization: {model.utilization():.1f}%", ln=True)
+    pdf.cell(0, 10, f"O2 Total: {stats['o2_total']:.1f} kg", ln=True)
+    pdf.cell(0, 10, f"CO2 Total: {stats['co2_total']:.1f} kg", ln=True)
+    pdf.cell(0, 10, f"O2/Day: {stats['o2_per_day']:.2f} kg", ln=True)
+    pdf.cell(0, 10, f"CO2/Day: {stats['co2_per_day']:.2f} kg", ln=True)
+
+    pdf.ln(10)
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 10, "Modules", ln=True)
+    pdf.set_font("Arial", size=12)
+    for module in model.modules:
+        pdf.cell(0, 10, f"{module['name']} (x{module.get('count', 1)}): {compute_volume(module):.1f} m³", ln=True)
+    return pdf
+
+
+def check_file(path, pdf_dir=None, json_dir=None):
+    """Validate one design file (and write its reports); returns a result dict."""
+    started = time.perf_counter()
+    result = {'file': path, 'format': None, 'valid': False, 'errors': [], 'issues': []}
+    timings = result['timing_ms'] = {}
+    try:
+        data = load_design(path)
+        result['format'] = fmt = detect_format(data)
+    except (OSError, ValueError, struct.error, KeyError, TypeError) as e:
+        result['errors'].append(f"unreadable: {e}")
+        timings['total'] = (time.perf_counter() - started) * 1000
+        return result
+    timings['parse'] = (time.perf_counter() - started) * 1000
+
+    t = time.perf_counter()
+    result['errors'] = schema_errors(fmt, data)
+    if not result['errors']:
+        if fmt == 'designer':
+            model = HabitatModel.from_dict(data)
+        else:
+            model = wizard_to_model(data)
+        result['issues'] = model.validate()
+        result['statistics'] = statistics = model.statistics()
+        if fmt == 'designer' and isinstance(data.get('statistics'), dict):
+            stale = _stale_statistics(data['statistics'], statistics)
+            if stale:
+                result['issues'].append(f"Stored statistics out of date: {', '.join(stale)}")
+        result['valid'] = not result['issues']
+    timings['check'] = (time.perf_counter() - t) * 1000
+
+    if not result['errors'] and (pdf_dir or json_dir):
+        t = time.perf_counter()
+        stem = os.path.splitext(os.path.basename(path))[0]
+        location = model.config.get('location', '')
+        if pdf_dir:
+            design_pdf(model, location).output(os.path.join(pdf_dir, f"{stem}.pdf"))
+        if json_dir:
+            report = dict(model.to_dict(), statistics=statistics,
+                          valid=result['valid'], issues=result['issues'], source=path)
+            with open(os.path.join(json_dir, f"{stem}.json"), 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        timings['report'] = (time.perf_counter() - t) * 1000
+    timings['total'] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def _check_chunk(task):
+    # One bad file must not take the rest of the batch (and the summary) down
+    paths, pdf_dir, json_dir = task
+    results = []
+    for path in paths:
+        try:
+            results.append(check_file(path, pdf_dir, json_dir))
+        except Exception as e:
+            results.append({'file': path, 'format': None, 'valid': False, 'issues': [],
+                            'errors': [f"check failed: {type(e).__name__}: {e}"],
+                            'timing_ms': {'total': 0.0}})
+    return results
+
+
+# =========================
+# BATCH
+# =========================
+def find_designs(paths):
+    """Expand directories (recursively) and globs into a sorted list of .json/.plnd files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for ext in ('.json', BINARY_EXT):
+                files += glob.glob(os.path.join(path, '**', '*' + ext), recursive=True)
+        else:
+            files += glob.glob(path) or [path]
+    return sorted(set(files))
+
+
+def check_designs(paths, pdf_dir=None, json_dir=None, workers=None):
+    """Check many design files; returns the summary dict (see main())."""
+    t0 = time.perf_counter()
+    for directory in (pdf_dir, json_dir):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    tasks = [(paths[i:i + CHUNK_FILES], pdf_dir, json_dir) for i in range(0, len(paths), CHUNK_FILES)]
+    if len(tasks) > 1 and workers != 1:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            chunks = list(pool.map(_check_chunk, tasks))
+    else:
+        chunks = [_check_chunk(task) for task in tasks]
+    results = [r for chunk in chunks for r in chunk]
+    elapsed = time.perf_counter() - t0
+
+    file_ms = sorted(r['timing_ms']['total'] for r in results)
+    return {
+        'files': len(results),
+        'valid': sum(r['valid'] for r in results),
+        'invalid': sum(not r['valid'] and not r['errors'] for r in results),
+        'errors': sum(bool(r['errors']) for r in results),
+        'formats': {fmt: sum(r['format'] == fmt for r in results) for fmt in ('designer', 'wizard')},
+        'elapsed_s': elapsed,
+        'workers': workers or os.cpu_count() if len(tasks) > 1 else 1,
+        'files_per_s': len(results) / elapsed if elapsed > 0 else 0.0,
+        'file_ms': {'mean': sum(file_ms) / len(file_ms) if file_ms else 0.0,
+                    'p95': file_ms[min(len(file_ms) - 1, int(len(file_ms) * 0.95))] if file_ms else 0.0,
+                    'max': file_ms[-1] if file_ms else 0.0},
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate saved habitat designs and write reports.")
+    parser.add_argument('paths', nargs='+', help="design .json files, globs or directories")
+    parser.add_argument('--pdf', metavar='DIR', help="write a PDF report per design into DIR")
+    parser.add_argument('--json', metavar='DIR', help="write a JSON report per design into DIR")
+    parser.add_argument('--summary', metavar='FILE', help="write the JSON summary to FILE instead of stdout")
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args(argv)
+
+    summary = check_designs(find_designs(args.paths), args.pdf, args.json, args.workers)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"{summary['files']} designs in {summary['elapsed_s']:.2f} s: {summary['valid']} valid, "
+              f"{summary['invalid']} invalid, {summary['errors']} unreadable", file=sys.stderr)
+    else:
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    return 0 if summary['valid'] == summary['files'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+"""Compact binary design files (.plnd) next to the JSON export.
+
+The designer's JSON export stores every module as an indented dict, which
+for generated layouts with tens of thousands of modules means tens of MB
+to parse before anything can be shown. A .plnd file stores the same design
+column by column instead:
+
+    header    magic, format version, module count, metadata offset/length
+    columns   one fixed-width little-endian array per field, 64-byte aligned
+    metadata  JSON: habitat config and other top-level keys, the string
+              table for module names/shapes, irregular values, column layout
+
+Numeric module fields (x, y, count, id and the side/radius/height params)
+are float64 columns with a bitmask of which fields a module has and which
+were integers, so a JSON -> .plnd -> JSON round trip gives back equal data.
+Values that do not fit a column (unknown keys, non-numeric values) are
+kept as JSON in the metadata. The transient drag offsets are not stored.
+
+Files are memory-mapped: columns are NumPy views into the mapping and
+module dicts are only built when accessed.
+
+    python design_binary.py to-binary design.json design.plnd
+    python design_binary.py to-json design.plnd design.json
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+from collections.abc import Sequence
+
+import numpy as np
+
+MAGIC = b"PLNDSGN\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQQQ")   # magic, version, reserved, reserved, modules, meta offset, meta length
+ALIGN = 64
+BINARY_EXT = ".plnd"
+TRANSIENT_KEYS = ('offset_x', 'offset_y')   # drag state, never saved
+
+NUMERIC = ['x', 'y', 'count', 'id']
+PARAMS = ['side', 'radius', 'height']
+NAME_BIT = 1 << 7
+SHAPE_BIT = 1 << 8
+PARAMS_BIT = 1 << 9
+COLUMNS = NUMERIC + PARAMS + ['present', 'integer', 'name', 'shape', 'extra']
+_MAX_EXACT = 2 ** 53   # integers a float64 holds exactly
+
+
+def _plain_number(value):
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return abs(value) <= _MAX_EXACT
+    return isinstance(value, float)
+
+
+def strip_transient(module):
+    """Copy of a placed module without the designer's drag state."""
+    return {k: v for k, v in module.items() if k not in TRANSIENT_KEYS}
+
+
+# =========================
+# WRITING
+# =========================
+def write_design(path, data):
+    """Write a designer-format dict ({'habitat', 'modules', ...}) as a .plnd file."""
+    modules = data.get('modules', [])
+    n = len(modules)
+    fields = NUMERIC + PARAMS
+    values = np.zeros((len(fields), n))
+    present = np.zeros(n, dtype=np.uint16)
+    integer = np.zeros(n, dtype=np.uint16)
+    name = np.zeros(n, dtype=np.int64)
+    shape = np.zeros(n, dtype=np.int64)
+    extra = np.zeros(n, dtype=np.uint32)
+    strings, string_index = [], {}
+    extras = [None]
+
+    def intern(text):
+        i = string_index.get(text)
+        if i is None:
+            i = string_index[text] = len(strings)
+            strings.append(text)
+        return i
+
+    for i, module in enumerate(modules):
+        rest = {}
+        for key, value in module.items():
+            if key in TRANSIENT_KEYS:
+                continue
+            if key in ('name', 'shape') and isinstance(value, str):
+                if key == 'name':
+                    name[i] = intern(value)
+                    present[i] |= NAME_BIT
+                else:
+                    shape[i] = intern(value)
+                    present[i] |= SHAPE_BIT
+            elif key in NUMERIC and _plain_number(value):
+                bit = fields.index(key)
+                values[bit, i] = value
+                present[i] |= 1 << bit
+                if isinstance(value, int):
+                    integer[i] |= 1 << bit
+            elif (key == 'params' and isinstance(value, dict)
+                  and all(k in PARAMS and _plain_number(v) for k, v in value.items())):
+                present[i] |= PARAMS_BIT
+                for k, v in value.items():
+                    bit = fields.index(k)
+                    values[bit, i] = v
+                    present[i] |= 1 << bit
+                    if isinstance(v, int):
+                        integer[i] |= 1 << bit
+            else:
+                rest[key] = value
+        if rest:
+            extra[i] = len(extras)
+            extras.append(rest)
+
+    index_dtype = '<u2' if len(strings) <= 0xFFFF else '<u4'
+    columns = [(f, values[j].astype('<f8')) for j, f in enumerate(fields)]
+    columns += [('present', present.astype('<u2')), ('integer', integer.astype('<u2')),
+                ('name', name.astype(index_dtype)), ('shape', shape.astype(index_dtype)),
+                ('extra', extra.astype('<u4'))]
+
+    layout = {}
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0, 0))
+        for column, array in columns:
+            f.write(b"\0" * (-f.tell() % ALIGN))
+            layout[column] = [f.tell(), array.dtype.str]
+            f.write(array.tobytes())
+        meta = {
+            'habitat': data.get('habitat', {}),
+            'top_level': {k: v for k, v in data.items() if k not in ('habitat', 'modules')},
+            'strings': strings,
+            'extras': extras,
+            'columns': layout,
+        }
+        blob = json.dumps(meta, separators=(',', ':')).encode()
+        offset = f.tell()
+        f.write(blob)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0, n, offset, len(blob)))
+    os.replace(tmp, path)
+    return path
+
+
+# =========================
+# READING
+# =========================
+class LazyModules(Sequence):
+    """Module dicts of a DesignFile, each built on first access."""
+
+    def __init__(self, design):
+        self._design = design
+        self._cache = {}
+
+    def __len__(self):
+        return self._design.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        module = self._cache.get(i)
+        if module is None:
+            module = self._cache[i] = self._design.module(i)
+        return module
+
+
+class DesignFile:
+    """A memory-mapped .plnd design; see module() and columns."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            if os.fstat(self._file.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path} is not a complete binary design file (shorter than its header)")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, _, count, offset, length = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a binary design file")
+            if version > VERSION:
+                raise ValueError(f"{path} has format version {version}; this build reads up to {VERSION}")
+            if offset < HEADER.size or offset + length > len(self._map):
+                raise ValueError(f"{path} is not a complete binary design file (metadata past the end)")
+            try:
+                self._read_meta(count, offset, json.loads(bytes(self._map[offset:offset + length])))
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{path} is not a valid binary design file: {e}") from e
+        except Exception:
+            self._file.close()
+            raise
+        self.count = count
+        self.version = version
+        self.modules = LazyModules(self)
+
+    def _read_meta(self, count, end, meta):
+        # Checks everything later reads trusts: types, that every column lies
+        # between the header and the metadata, and that string / extras
+        # indices are in range.
+        self.habitat = meta['habitat']
+        self.top_level = meta['top_level']
+        self.strings = meta['strings']
+        self._extras = meta['extras']
+        if not (isinstance(self.habitat, dict) and isinstance(self.top_level, dict)
+                and isinstance(self.strings, list) and isinstance(self._extras, list)):
+            raise ValueError("malformed metadata")
+        columns = {}
+        for name in COLUMNS:
+            off, dtype = meta['columns'][name]
+            dtype = np.dtype(dtype)
+            if type(off) is not int or dtype.kind not in ('uif' if name in NUMERIC + PARAMS else 'u'):
+                raise ValueError(f"malformed column {name!r}")
+            if off < HEADER.size or off + dtype.itemsize * count > end:
+                raise ValueError(f"column {name!r} lies outside the file")
+            columns[name] = np.frombuffer(self._map, dtype=dtype, count=count, offset=off)
+        present = columns['present']
+        for name, bit in (('name', NAME_BIT), ('shape', SHAPE_BIT)):
+            if (columns[name][(present & bit) != 0] >= len(self.strings)).any():
+                raise ValueError(f"{name} index past the string table")
+        if (columns['extra'] >= len(self._extras)).any():
+            raise ValueError("extras index past the extras table")
+        self.columns = columns
+
+    def _plan(self, present, integer):
+        # Steps rebuilding a module dict for one (present, integer) mask pair
+        fields = NUMERIC + PARAMS
+        steps = []
+        if present & NAME_BIT:
+            steps.append(('name', None, 'name', False))
+        if present & SHAPE_BIT:
+            steps.append(('shape', None, 'shape', False))
+        if present & PARAMS_BIT:
+            steps.append(('params', None, None, False))
+            steps += [('params', k, k, bool(integer >> fields.index(k) & 1))
+                      for k in PARAMS if present >> fields.index(k) & 1]
+        steps += [(k, None, k, bool(integer >> fields.index(k) & 1))
+                  for k in NUMERIC if present >> fields.index(k) & 1]
+        return steps
+
+    def _build(self, start, stop):
+        cols = {k: v[start:stop].tolist() for k, v in self.columns.items()}
+        strings, extras = self.strings, self._extras
+        plans = {}
+        modules = []
+        for j, (present, integer, extra) in enumerate(zip(cols['present'], cols['integer'], cols['extra'])):
+            plan = plans.get((present, integer))
+            if plan is None:
+                plan = plans[(present, integer)] = self._plan(present, integer)
+            module = {}
+            for key, sub, column, is_int in plan:
+                if column is None:
+                    module['params'] = {}
+                    continue
+                v = cols[column][j]
+                if column in ('name', 'shape'):
+                    v = strings[v]
+                elif is_int:
+                    v = int(v)
+                if sub is None:
+                    module[key] = v
+                else:
+                    module['params'][sub] = v
+            if extra:
+                module.update(extras[extra])
+            modules.append(module)
+        return modules
+
+    def module(self, i):
+        """Module i as the dict the JSON export would contain."""
+        return self._build(i, i + 1)[0]
+
+    def to_dict(self):
+        """The full design in the designer's JSON export format."""
+        data = {'habitat': dict(self.habitat), 'modules': self._build(0, self.count)}
+        data.update(self.top_level)
+        return data
+
+    def module_table(self):
+        """Columnar module table for habitat_batch, without building module dicts."""
+        from habitat_batch import MODULE_NAMES, MODULE_SHAPES
+        lookup = np.array([MODULE_NAMES.index(s) if s in MODULE_NAMES else -1 for s in self.strings] or [-1])
+        shapes = np.array([MODULE_SHAPES.index(s) if s in MODULE_SHAPES else MODULE_SHAPES.index('other')
+                           for s in self.strings] or [0])
+        present = self.columns['present']
+        count_bit = 1 << NUMERIC.index('count')
+        if (lookup[self.columns['name']] < 0).any() or not (present & NAME_BIT).all():
+            raise ValueError("design has modules without a known name")
+        return {
+            'design': np.zeros(self.count, dtype=np.int64),
+            'name': lookup[self.columns['name']],
+            'shape': np.where(present & SHAPE_BIT, shapes[self.columns['shape']], MODULE_SHAPES.index('cube')),
+            'side': self.columns['side'],
+            'radius': self.columns['radius'],
+            'height': self.columns['height'],
+            'count': np.where(present & count_bit, self.columns['count'], 1.0),
+        }
+
+    def close(self):
+        self.columns = {}
+        self.modules = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # column arrays still referenced elsewhere; the mapping goes with them
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def read_design(path):
+    return DesignFile(path)
+
+
+def load_design(path):
+    """Designer-format dict from either a .plnd or a JSON file."""
+    if path.endswith(BINARY_EXT):
+        with DesignFile(path) as design:
+            return design.to_dict()
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_design(path, data):
+    """Write `data` as .plnd or indented JSON depending on the extension."""
+    data = dict(data, modules=[strip_transient(m) for m in data.get('modules', [])])
+    if path.endswith(BINARY_EXT):
+        return write_design(path, data)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    return path
+
+
+# =========================
+# CLI
+# =========================
+def _benchmark(n=50000):
+    from habitat_batch import _random_models
+    import tempfile
+    modules = [m for model in _random_models(n // 7 + 1, seed=0) for m in model.modules][:n]
+    for i, m in enumerate(modules):
+        m.update(id=i + 1, x=float(np.float32(i % 700)), y=i // 700 * 3)
+    data = {'habitat': {'shape': 'modular', 'length': 500.0, 'diameter': 500.0, 'height': 10.0,
+                        'crew_size': 6, 'mission_duration': 18}, 'modules': modules}
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, bin_path = os.path.join(tmp, "d.json"), os.path.join(tmp, "d.plnd")
+        save_design(json_path, data)
+        save_design(bin_path, data)
+        t0 = time.perf_counter()
+        with open(json_path) as f:
+            from_json = json.load(f)
+        t_json = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        design = read_design(bin_path)
+        t_open = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        from_bin = design.to_dict()
+        t_full = time.perf_counter() - t0
+        assert from_bin == from_json
+        print(f"{len(modules)} modules: JSON {os.path.getsize(json_path) / 1e6:.1f} MB, "
+              f".plnd {os.path.getsize(bin_path) / 1e6:.1f} MB")
+        print(f"json.load:        {t_json * 1000:8.1f} ms")
+        print(f".plnd open:       {t_open * 1000:8.1f} ms  (columns mapped, no modules built)")
+        print(f".plnd to_dict():  {t_full * 1000:8.1f} ms")
+        design.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert designs between JSON and the binary .plnd format.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    for command in ('to-binary', 'to-json'):
+        p = sub.add_parser(command)
+        p.add_argument('source')
+        p.add_argument('target')
+    p = sub.add_parser('bench')
+    p.add_argument('--modules', type=int, default=50000)
+    args = parser.parse_args(argv)
+    if args.command == 'bench':
+        _benchmark(args.modules)
+        return
+    save_design(args.target, load_design(args.source))
+    print(f"Wrote {args.target} ({os.path.getsize(args.target) / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""Design-space sweeps over habitat dimensions, crew size and mission duration.
+
+Evaluates a full grid or a Latin-hypercube sample of the designer's slider
+parameters against one fixed module layout, in chunks spread over a process
+pool. Each chunk is evaluated with habitat_batch (one vectorized pass),
+appended to a CSV (or Parquet, when pyarrow is installed) file and reduced
+to its Pareto-optimal rows, so only the running front stays in memory.
+
+    python design_sweep.py --method lhs --samples 1000000 --out sweep.csv
+"""
+import argparse
+import bisect
+import csv
+import itertools
+import math
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from habitat_batch import evaluate_shared
+from habitat_model import DEFAULT_HABITAT_CONFIG
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet output is optional
+    pyarrow = None
+
+# Same ranges as the designer sliders
+DEFAULT_SPACE = {
+    'length': (3, 50),
+    'diameter': (3, 30),
+    'height': (2, 20),
+    'crew_size': (1, 20),
+    'mission_duration': (1, 60),
+}
+INTEGER_PARAMS = {'crew_size', 'mission_duration'}
+MAX_PENDING_PER_WORKER = 2
+PARAMS = ['shape', 'length', 'diameter', 'height', 'crew_size', 'mission_duration']
+METRICS = ['total_volume', 'used_volume', 'utilization', 'volume_per_crew',
+           'o2_total', 'co2_total', 'valid']
+# (column, 'max' | 'min')
+DEFAULT_OBJECTIVES = [('volume_per_crew', 'max'), ('utilization', 'max'), ('o2_total', 'max')]
+
+
+# =========================
+# PARETO FRONT
+# =========================
+def _pareto_staircase(values):
+    # Sweep in decreasing first objective and keep a 2-D staircase of the
+    # best (second, third) pairs seen so far: O(n log n) for two or three
+    # objectives, where design sweeps have very large fronts.
+    if values.shape[1] == 2:
+        values = np.column_stack([values, np.zeros(len(values))])
+    order = np.lexsort((-values[:, 2], -values[:, 1], -values[:, 0]))
+    xs, ys = [], []  # xs ascending, ys descending
+    keep = []
+    for i, a, b in zip(order.tolist(), values[order, 1].tolist(), values[order, 2].tolist()):
+        j = bisect.bisect_left(xs, a)
+        if j < len(xs) and ys[j] >= b:
+            continue  # some earlier point is at least as good everywhere
+        keep.append(i)
+        r = bisect.bisect_right(xs, a)
+        k = r
+        while k > 0 and ys[k - 1] <= b:
+            k -= 1
+        xs[k:r] = [a]
+        ys[k:r] = [b]
+    return np.sort(np.asarray(keep, dtype=np.int64))
+
+
+def pareto_indices(values):
+    """Indices of non-dominated rows of `values` (n, k), every column maximised.
+
+    With two or three objectives, exact duplicate rows are collapsed to one.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 2 and values.shape[1] in (2, 3):
+        return _pareto_staircase(values)
+    idx = np.arange(len(values))
+    order = np.argsort(-values[:, 0], kind='stable')
+    pts, idx = values[order], idx[order]
+    i = 0
+    while i < len(pts):
+        dominated = np.all(pts <= pts[i], axis=1) & np.any(pts < pts[i], axis=1)
+        keep = ~dominated
+        i = int(np.count_nonzero(keep[:i])) + 1
+        pts, idx = pts[keep], idx[keep]
+    return np.sort(idx)
+
+
+def _objective_matrix(columns, objectives):
+    return np.column_stack([columns[c] if sense == 'max' else -np.asarray(columns[c], dtype=float)
+                            for c, sense in objectives])
+
+
+# =========================
+# SAMPLING
+# =========================
+def _grid_points(space, start, stop):
+    names = list(space)
+    axes = [np.asarray(space[n]) for n in names]
+    flat = np.unravel_index(np.arange(start, stop), [len(a) for a in axes])
+    return {n: a[i] for n, a, i in zip(names, axes, flat)}
+
+
+def _lhs_points(space, strata_rows, n_total, rng):
+    """Latin-hypercube points for one chunk; strata_rows[d] holds each point's stratum."""
+    points = {}
+    for d, (name, spec) in enumerate(space.items()):
+        strata = strata_rows[d]
+        if isinstance(spec, tuple):  # (lo, hi) range
+            lo, hi = spec
+            u = (strata + rng.random(len(strata))) / n_total
+            vals = lo + u * (hi - lo)
+            points[name] = np.round(vals) if name in INTEGER_PARAMS else vals
+        else:  # categorical: spread categories evenly over the strata
+            choices = np.asarray(spec)
+            points[name] = choices[strata * len(choices) // n_total]
+    return points
+
+
+def _evaluate_chunk(task):
+    method, space, base, modules, objectives, start, stop, extra = task
+    if method == 'grid':
+        points = _grid_points(space, start, stop)
+    else:
+        strata_rows, seed, total = extra
+        points = _lhs_points(space, strata_rows, total, np.random.default_rng(seed))
+    n = stop - start
+    cols = {p: np.broadcast_to(np.asarray(points.get(p, base[p])), (n,)) for p in PARAMS}
+    res = evaluate_shared(cols['shape'], cols['length'], cols['diameter'], cols['height'],
+                          cols['crew_size'], cols['mission_duration'], modules)
+    cols.update({m: np.asarray(res[m]) for m in METRICS})
+    front = pareto_indices(_objective_matrix(cols, objectives))
+    return start, cols, front
+
+
+# =========================
+# OUTPUT
+# =========================
+class _CsvSink:
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(PARAMS + METRICS)
+
+    def write(self, cols):
+        self._writer.writerows(zip(*(cols[c].tolist() for c in PARAMS + METRICS)))
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        self._path = path
+        self._writer = None
+
+    def write(self, cols):
+        table = pyarrow.table({c: np.asarray(cols[c]) for c in PARAMS + METRICS})
+        if self._writer is None:
+            self._writer = pyarrow.parquet.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)  # one row group per chunk
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _open_sink(path):
+    if path is None:
+        return None
+    if path.endswith('.parquet'):
+        if pyarrow is None:
+            raise RuntimeError("Parquet output needs pyarrow; use a .csv path instead")
+        return _ParquetSink(path)
+    return _CsvSink(path)
+
+
+# =========================
+# SWEEP
+# =========================
+def sweep(space=None, modules=(), method='grid', samples=10000, base=None,
+          objectives=DEFAULT_OBJECTIVES, output=None, chunk_size=50000,
+          workers=None, seed=None, on_progress=None):
+    """Evaluate a design space and return its Pareto front.
+
+    `space` maps parameter names to a list of values or a (lo, hi) tuple.
+    Grids expand tuples to 10 steps, Latin hypercubes sample them
+    continuously; both round crew/duration to whole values. Latin
+    hypercubes spread lists, such as shapes, evenly over the strata.
+    Parameters not in `space` come from `base` (default:
+    DEFAULT_HABITAT_CONFIG). Returns {'evaluated': n, 'pareto': {column:
+    array}} with the Pareto rows of all evaluated points.
+    """
+    space = dict(space or DEFAULT_SPACE)
+    base = dict(DEFAULT_HABITAT_CONFIG, **(base or {}))
+    modules = [dict(m) for m in modules]
+    if method == 'grid':
+        space = {k: (list(np.linspace(v[0], v[1], 10)) if isinstance(v, tuple) else list(v))
+                 for k, v in space.items()}
+        for k in INTEGER_PARAMS & set(space):
+            space[k] = list(np.unique(np.round(space[k])))   # like LHS: whole crew, whole months
+        total = int(np.prod([len(v) for v in space.values()]))
+        perms = None
+    elif method == 'lhs':
+        total = int(samples)
+        rng = np.random.default_rng(seed)
+        perms = np.stack([rng.permutation(total).astype(np.int32) for _ in space]) if space \
+            else np.zeros((0, total), np.int32)
+    else:
+        raise ValueError(f"Unknown sweep method: {method}")
+
+    seeds = np.random.SeedSequence(seed).spawn(math.ceil(total / chunk_size) or 1)
+    tasks = []
+    for k, start in enumerate(range(0, total, chunk_size)):
+        stop = min(total, start + chunk_size)
+        extra = (perms[:, start:stop], seeds[k], total) if perms is not None else None
+        tasks.append((method, space, base, modules, objectives, start, stop, extra))
+
+    sink = _open_sink(output)
+    front = None
+    done = 0
+    ctx = multiprocessing.get_context("spawn")
+    # At most MAX_PENDING_PER_WORKER chunks per worker are queued or finished
+    # but unconsumed, so a slow writer throttles the workers instead of
+    # letting their results pile up in memory
+    max_pending = MAX_PENDING_PER_WORKER * (workers or os.cpu_count() or 1)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            pending = deque()
+            queued = iter(tasks)
+            for task in itertools.islice(queued, max_pending):
+                pending.append(pool.submit(_evaluate_chunk, task))
+            while pending:
+                start, cols, local = pending.popleft().result()
+                for task in itertools.islice(queued, 1):
+                    pending.append(pool.submit(_evaluate_chunk, task))
+                if sink is not None:
+                    sink.write(cols)
+                rows = {c: np.asarray(cols[c])[local] for c in PARAMS + METRICS}
+                if front is not None:
+                    rows = {c: np.concatenate([front[c], rows[c]]) for c in rows}
+                keep = pareto_indices(_objective_matrix(rows, objectives))
+                front = {c: v[keep] for c, v in rows.items()}
+                done += len(cols['length'])
+                if on_progress:
+                    on_progress(done, total)
+    finally:
+        if sink is not None:
+            sink.close()
+    return {'evaluated': done, 'pareto': front or {c: np.array([]) for c in PARAMS + METRICS}}
+
+
+def _parse_range(text):
+    parts = text.split(':')
+    if len(parts) == 3:  # lo:hi:steps for grids
+        return list(np.linspace(float(parts[0]), float(parts[1]), int(parts[2])))
+    return (float(parts[0]), float(parts[1]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep habitat parameters and report the Pareto front.")
+    parser.add_argument('--method', choices=['grid', 'lhs'], default='lhs')
+    parser.add_argument('--samples', type=int, default=100000, help="LHS sample count")
+    parser.add_argument('--design', help="designer JSON or .plnd export whose modules are used for every point")
+    parser.add_argument('--out', help="stream all rows to this .csv or .parquet file")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--shapes', default='cylindrical,spherical,dome,modular')
+    for name, (lo, hi) in DEFAULT_SPACE.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, default=f"{lo}:{hi}",
+                            help="lo:hi (lhs) or lo:hi:steps (grid)")
+    args = parser.parse_args(argv)
+
+    space = {'shape': args.shapes.split(',')}
+    space.update({name: _parse_range(getattr(args, name)) for name in DEFAULT_SPACE})
+    modules, base = [], None
+    if args.design:
+        from design_binary import load_design
+        data = load_design(args.design)
+        modules, base = data.get('modules', []), data.get('habitat')
+
+    t0 = time.perf_counter()
+    result = sweep(space, modules, method=args.method, samples=args.samples, base=base,
+                   output=args.out, workers=args.workers, seed=args.seed)
+    elapsed = time.perf_counter() - t0
+    front = result['pareto']
+    print(f"Evaluated {result['evaluated']} designs in {elapsed:.2f} s "
+          f"({result['evaluated'] / max(elapsed, 1e-9):,.0f}/s); {len(front['length'])} Pareto-optimal")
+    order = np.argsort(-front['volume_per_crew'])[:20]
+    print(f"{'shape':>12} {'L':>6} {'D':>6} {'H':>6} {'crew':>5} {'mo':>4} {'vol/crew':>9} {'util%':>7} {'O2 kg':>9}")
+    for i in order:
+        print(f"{front['shape'][i]:>12} {front['length'][i]:6.1f} {front['diameter'][i]:6.1f} "
+              f"{front['height'][i]:6.1f} {int(front['crew_size'][i]):5d} {int(front['mission_duration'][i]):4d} "
+              f"{front['volume_per_crew'][i]:9.1f} {front['utilization'][i]:7.2f} {front['o2_total'][i]:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Memoized, lazily decoded animated GIF frames.
+
+Frames are keyed by (path, size, mtime), so the selector's 100 px globes
+and the wizard's 90 px ones are separate entries while repeated visits and
+the two step 2 astronauts share one. A frame is decoded and resized the
+first time it is displayed. Once every frame of a GIF has been resized,
+they are written as one PNG strip under the cache directory, and later
+launches crop frames from that strip instead of resampling again. GIFs
+shipped in the prebuilt asset pack (asset_pack.py) skip both and crop from
+the memory-mapped strip.
+
+The app keeps one Tk root for its whole run (screens.ScreenManager), so
+the PhotoImages are cached alongside the frames and every screen showing a
+GIF at a given size reuses the same ones.
+"""
+import hashlib
+import os
+from collections.abc import Sequence
+
+from PIL import Image, ImageTk
+
+import asset_pack
+from http_cache import CACHE_DIR
+
+STORE_DIR = os.path.join(CACHE_DIR, "gif_frames")
+
+_sources = {}   # (path, size, mtime) -> _FrameSource
+_photos = {}    # (path, size, mtime) -> GifFrames
+
+
+def _packed_strip(path, size):
+    """Frame strip from the prebuilt asset pack, if it has this GIF at this size."""
+    pack = asset_pack.default_pack()
+    if pack is None or os.path.dirname(os.path.abspath(path)) != pack.directory:
+        return None
+    return pack.gif_strip(os.path.basename(path), size)
+
+
+class _FrameSource:
+    """Resized PIL frames of one GIF at one size, decoded on demand."""
+
+    def __init__(self, path, size, mtime):
+        self.path = path
+        self.size = size
+        digest = hashlib.sha1(f"{os.path.abspath(path)}|{size[0]}x{size[1]}|{mtime}".encode()).hexdigest()
+        self.strip_path = os.path.join(STORE_DIR, f"{digest}.png")
+        self._gif = None
+        self._strip = None
+        packed = _packed_strip(path, size)
+        if packed is not None:
+            self._strip, self.count = packed
+            self._frames = [None] * self.count
+            return
+        try:
+            with Image.open(self.strip_path) as f:
+                self._strip = f.copy()
+            self.count = self._strip.width // size[0]
+        except (OSError, ValueError):
+            self._gif = Image.open(path)
+            self.count = getattr(self._gif, "n_frames", 1)
+        self._frames = [None] * self.count
+
+    def frame(self, i):
+        img = self._frames[i]
+        if img is None:
+            w, h = self.size
+            if self._strip is not None:
+                img = self._strip.crop((i * w, 0, (i + 1) * w, h))
+            else:
+                self._gif.seek(i)
+                img = self._gif.convert("RGBA").resize(self.size, Image.Resampling.LANCZOS)
+            self._frames[i] = img
+            if self._gif is not None and all(f is not None for f in self._frames):
+                self._gif.close()
+                self._gif = None
+                self._save_strip()
+        return img
+
+    def _save_strip(self):
+        w, h = self.size
+        strip = Image.new("RGBA", (w * self.count, h))
+        for i, img in enumerate(self._frames):
+            strip.paste(img, (i * w, 0))
+        try:
+            os.makedirs(STORE_DIR, exist_ok=True)
+            tmp = self.strip_path + ".tmp"
+            strip.save(tmp, "PNG")
+            os.replace(tmp, self.strip_path)
+        except OSError as e:
+            print(f"Could not store GIF frames for {self.path}: {e}")
+
+
+class GifFrames(Sequence):
+    """Sequence of PhotoImages for animate_gif; each built on first access."""
+
+    def __init__(self, source, master=None):
+        self._source = source
+        self._master = master
+        self._photos = [None] * source.count
+
+    def __len__(self):
+        return self._source.count
+
+    def __getitem__(self, i):
+        photo = self._photos[i]
+        if photo is None:
+            photo = self._photos[i] = ImageTk.PhotoImage(self._source.frame(i), master=self._master)
+        return photo
+
+
+def gif_frames(path, size, master=None):
+    """Shared lazily decoded frames of `path` at `size` (raises OSError if unreadable)."""
+    size = (int(size[0]), int(size[1]))
+    key = (path, size, os.path.getmtime(path))
+    source = _sources.get(key)
+    if source is None:
+        source = _sources[key] = _FrameSource(path, size, key[2])
+    frames = _photos.get(key)
+    if frames is None:
+        frames = _photos[key] = GifFrames(source, master)
+    return frames
@@ -0,0 +1,265 @@
+"""Vectorized evaluation of many habitat designs at once.
+
+Mirrors HabitatModel.habitat_volume / used_volume / utilization / gas_stats /
+validate (minus the layout checks), but over NumPy arrays: one row per
+design for the habitat parameters and a columnar module table (one row per
+placed module, with a `design` column pointing back at its design row).
+
+Run this file directly for a benchmark against the scalar model; the
+agreement between the two lives in tests/test_habitat_batch.py.
+"""
+import math
+import time
+
+import numpy as np
+
+from habitat_model import (HabitatModel, NASA_MODULES, CRITICAL_SYSTEMS, CREW_O2_RATE, CREW_CO2_RATE,
+                           MIN_VOLUME_PER_CREW, DAYS_PER_MONTH)
+
+HABITAT_SHAPES = ['cylindrical', 'spherical', 'dome', 'modular']
+MODULE_SHAPES = ['cube', 'sphere', 'cylinder', 'hexagonal', 'triangle', 'other']
+MODULE_NAMES = list(NASA_MODULES)
+
+_DEFAULT_VOLUME = np.array([NASA_MODULES[n]['volume'] for n in MODULE_NAMES])
+_O2_RATE = np.array([NASA_MODULES[n]['o2_rate'] for n in MODULE_NAMES])
+_CO2_RATE = np.array([NASA_MODULES[n]['co2_rate'] for n in MODULE_NAMES])
+
+
+def encode(values, vocabulary, default=None):
+    """Map an array of strings onto integer codes of `vocabulary`.
+
+    Unknown strings get `default` (or raise KeyError when default is None).
+    Arrays that are already integer are returned unchanged.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        return values.astype(np.int64, copy=False)
+    uniq, inverse = np.unique(values, return_inverse=True)
+    lookup = {v: i for i, v in enumerate(vocabulary)}
+    codes = []
+    for u in uniq:
+        if u in lookup:
+            codes.append(lookup[u])
+        elif default is not None:
+            codes.append(default)
+        else:
+            raise KeyError(u)
+    return np.asarray(codes, dtype=np.int64)[inverse.reshape(-1)]
+
+
+def module_table(designs_modules):
+    """Build a columnar module table from a list of per-design module lists."""
+    rows = [(d, m) for d, modules in enumerate(designs_modules) for m in modules]
+    n = len(rows)
+    table = {
+        'design': np.empty(n, dtype=np.int64),
+        'name': np.empty(n, dtype=np.int64),
+        'shape': np.empty(n, dtype=np.int64),
+        'side': np.zeros(n),
+        'radius': np.zeros(n),
+        'height': np.zeros(n),
+        'count': np.ones(n),
+    }
+    other = MODULE_SHAPES.index('other')
+    for i, (d, m) in enumerate(rows):
+        params = m.get('params', {})
+        shape = m.get('shape', 'cube')
+        table['design'][i] = d
+        table['name'][i] = MODULE_NAMES.index(m['name'])
+        table['shape'][i] = MODULE_SHAPES.index(shape) if shape in MODULE_SHAPES else other
+        table['side'][i] = params.get('side', 0)
+        table['radius'][i] = params.get('radius', 0)
+        table['height'][i] = params.get('height', 0)
+        table['count'][i] = m.get('count', 1)
+    return table
+
+
+def habitat_volumes(shape, length, diameter, height):
+    shape = encode(shape, HABITAT_SHAPES, default=HABITAT_SHAPES.index('modular'))
+    length = np.asarray(length, dtype=float)
+    diameter = np.asarray(diameter, dtype=float)
+    height = np.asarray(height, dtype=float)
+    r = diameter / 2
+    return np.select(
+        [shape == 0, shape == 1, shape == 2],
+        [math.pi * r * r * length,
+         (4/3) * math.pi * r * r * r,
+         (2/3) * math.pi * r * r * r + math.pi * r * r * height],
+        default=length * diameter * height)
+
+
+def module_volumes(table):
+    shape = encode(table['shape'], MODULE_SHAPES, default=MODULE_SHAPES.index('other'))
+    name = encode(table['name'], MODULE_NAMES)
+    side = np.asarray(table.get('side', 0), dtype=float)
+    radius = np.asarray(table.get('radius', 0), dtype=float)
+    height = np.asarray(table.get('height', 0), dtype=float)
+    count = np.asarray(table.get('count', 1), dtype=float)
+    per_unit = np.select(
+        [shape == 0, shape == 1, shape == 2, shape == 3, shape == 4],
+        [side ** 3,
+         4/3 * math.pi * radius ** 3,
+         math.pi * radius ** 2 * height,
+         (3 * math.sqrt(3) / 2) * side ** 2 * height,
+         (math.sqrt(3) / 4) * side ** 2 * height],
+        default=_DEFAULT_VOLUME[name])
+    return per_unit * count
+
+
+def module_aggregates(modules, n):
+    """Per-design sums over a columnar module table (length-n arrays)."""
+    design = np.asarray(modules['design'], dtype=np.int64)
+    name = encode(modules['name'], MODULE_NAMES)
+    count = np.asarray(modules.get('count', np.ones(design.shape[0])), dtype=float)
+    critical_ok = np.ones(n, dtype=bool)
+    for system in CRITICAL_SYSTEMS:
+        present = np.bincount(design[name == MODULE_NAMES.index(system)], minlength=n) > 0
+        critical_ok &= present
+    return {
+        'used_volume': np.bincount(design, weights=module_volumes(modules), minlength=n),
+        'o2_rate': np.bincount(design, weights=_O2_RATE[name] * count, minlength=n),
+        'co2_rate': np.bincount(design, weights=_CO2_RATE[name] * count, minlength=n),
+        'crew_quarters': np.bincount(design, weights=count * (name == MODULE_NAMES.index('Crew Quarters')),
+                                     minlength=n),
+        'critical_ok': critical_ok,
+    }
+
+
+def _combine(total, crew_size, mission_duration, agg):
+    crew = np.asarray(crew_size, dtype=float)
+    days = np.asarray(mission_duration, dtype=float) * DAYS_PER_MONTH
+    used = agg['used_volume']
+
+    o2_total = (agg['o2_rate'] - crew * CREW_O2_RATE) * days
+    co2_total = (agg['co2_rate'] + crew * CREW_CO2_RATE) * days
+    with np.errstate(divide='ignore', invalid='ignore'):
+        utilization = np.where(total > 0, used / total * 100, 0.0)
+        o2_per_day = np.where(days > 0, o2_total / days, 0.0)
+        co2_per_day = np.where(days > 0, co2_total / days, 0.0)
+    vol_per_crew = total / np.maximum(1, crew)
+
+    shape = np.broadcast(total, crew, days).shape
+    result = {
+        'total_volume': total,
+        'used_volume': used,
+        'utilization': utilization,
+        'volume_per_crew': vol_per_crew,
+        'o2_total': o2_total,
+        'co2_total': co2_total,
+        'o2_per_day': o2_per_day,
+        'co2_per_day': co2_per_day,
+        'volume_ok': vol_per_crew >= MIN_VOLUME_PER_CREW,
+        'critical_ok': agg['critical_ok'],
+        'quarters_ok': agg['crew_quarters'] >= crew,
+        'o2_ok': o2_total >= 0,
+        'co2_ok': co2_total <= 0,
+    }
+    result = {k: np.broadcast_to(v, shape) for k, v in result.items()}
+    result['valid'] = (result['volume_ok'] & result['critical_ok'] & result['quarters_ok']
+                       & result['o2_ok'] & result['co2_ok'])
+    return result
+
+
+def evaluate_batch(shape, length, diameter, height, crew_size, mission_duration, modules):
+    """Evaluate N designs in one pass; returns a dict of length-N arrays.
+
+    `mission_duration` is in months like habitat_config. `modules` is a
+    columnar table as produced by module_table(); its `name` and `shape`
+    columns may hold either strings or integer codes.
+    """
+    total = habitat_volumes(shape, length, diameter, height)
+    return _combine(total, crew_size, mission_duration, module_aggregates(modules, total.shape[0]))
+
+
+def evaluate_shared(shape, length, diameter, height, crew_size, mission_duration, modules):
+    """Like evaluate_batch, but every design uses the same list of module dicts.
+
+    Module sums are computed once and broadcast, which is what parameter
+    sweeps over a fixed layout need.
+    """
+    total = habitat_volumes(shape, length, diameter, height)
+    return _combine(total, crew_size, mission_duration, module_aggregates(module_table([modules]), 1))
+
+
+def evaluate_models(models):
+    """Convenience wrapper: evaluate a list of HabitatModel objects."""
+    cfgs = [m.config for m in models]
+    return evaluate_batch(
+        [c['shape'] for c in cfgs],
+        [c['length'] for c in cfgs],
+        [c['diameter'] for c in cfgs],
+        [c['height'] for c in cfgs],
+        [c['crew_size'] for c in cfgs],
+        [c['mission_duration'] for c in cfgs],
+        module_table([m.modules for m in models]))
+
+
+# =========================
+# BENCHMARK
+# =========================
+def _random_models(n, seed=0):
+    rng = np.random.default_rng(seed)
+    shapes = ['cube', 'sphere', 'cylinder', 'hexagonal', 'triangle']
+    models = []
+    for _ in range(n):
+        modules = []
+        for _ in range(rng.integers(0, 15)):
+            modules.append({
+                'name': MODULE_NAMES[rng.integers(len(MODULE_NAMES))],
+                'shape': shapes[rng.integers(len(shapes))],
+                'params': {'side': float(rng.uniform(1, 4)), 'radius': float(rng.uniform(0.5, 2)),
+                           'height': float(rng.uniform(1, 3))},
+                'count': int(rng.integers(1, 4)),
+            })
+        models.append(HabitatModel({
+            'shape': HABITAT_SHAPES[rng.integers(len(HABITAT_SHAPES))],
+            'length': float(rng.uniform(3, 50)),
+            'diameter': float(rng.uniform(3, 30)),
+            'height': float(rng.uniform(2, 20)),
+            'crew_size': int(rng.integers(1, 21)),
+            'mission_duration': int(rng.integers(1, 61)),
+        }, modules))
+    return models
+
+
+def _benchmark(n=20000):
+    # Both paths start from the raw (config, modules) dicts a batch of
+    # design files would give: HabitatModel computes its totals while it is
+    # being built, so building the models is part of the scalar cost.
+    raw = [(dict(m.config), [dict(mod) for mod in m.modules]) for m in _random_models(n)]
+
+    t0 = time.perf_counter()
+    scalar = []
+    for config, modules in raw:
+        m = HabitatModel(config, modules)
+        scalar.append((m.habitat_volume(), m.used_volume(), m.utilization(), m.gas_stats(),
+                       not m.validate(check_layout=False)))
+    t_scalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    table = module_table([modules for _, modules in raw])
+    t_table = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    batch = evaluate_batch(*_config_columns([config for config, _ in raw]), table)
+    t_batch = time.perf_counter() - t0
+
+    # Untimed sanity check; tests/test_habitat_batch.py compares every metric
+    assert np.allclose(batch['total_volume'], [r[0] for r in scalar])
+    assert np.allclose(batch['used_volume'], [r[1] for r in scalar])
+    assert np.allclose(batch['o2_total'], [r[3]['o2_total'] for r in scalar])
+    assert (batch['valid'] == [r[4] for r in scalar]).all()
+
+    print(f"{n} designs, {len(table['design'])} modules")
+    print(f"scalar (build + evaluate): {t_scalar * 1000:8.1f} ms")
+    print(f"batch module_table():      {t_table * 1000:8.1f} ms")
+    print(f"batch evaluate (NumPy):    {t_batch * 1000:8.1f} ms  "
+          f"({t_scalar / t_batch:.1f}x, {t_scalar / (t_table + t_batch):.1f}x with the table)")
+
+
+def _config_columns(configs):
+    return tuple([c[k] for c in configs]
+                 for k in ('shape', 'length', 'diameter', 'height', 'crew_size', 'mission_duration'))
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,323 @@
+"""Tk-free habitat evaluation engine.
+
+Everything here is plain Python so it can be imported by worker processes,
+services and the CLI without a display. The designer window keeps one
+HabitatModel instance and reads/writes it instead of module-level globals.
+"""
+import math
+
+# =========================
+# GLOBALS, DATA
+# =========================
+NASA_MODULES = {
+    'Life Support': {'volume': 15.2, 'color': '#ff6b6b', 'icon': '🫁', 'category': 'critical', 'o2_rate': 0.84, 'co2_rate': 0.82},  # kg/day per person
+    'Waste Management': {'volume': 8.1, 'color': '#8b4513', 'icon': '🚽', 'category': 'critical', 'o2_rate': 0.0, 'co2_rate': -0.5},  # CO2 scrubber
+    'Thermal Control': {'volume': 12.5, 'color': '#ff8c42', 'icon': '🌡️', 'category': 'critical', 'o2_rate': 0.0, 'co2_rate': 0.0},
+    'Communications': {'volume': 6.2, 'color': '#4ecdc4', 'icon': '📡', 'category': 'operations', 'o2_rate': 0.0, 'co2_rate': 0.0},
+    'Power Systems': {'volume': 18.7, 'color': '#ffe66d', 'icon': '⚡', 'category': 'critical', 'o2_rate': 0.0, 'co2_rate': 0.0},
+    'Stowage': {'volume': 25.8, 'color': '#a8e6cf', 'icon': '📦', 'category': 'operations', 'o2_rate': 0.0, 'co2_rate': 0.0},
+    'Food Storage': {'volume': 20.4, 'color': '#ff8b94', 'icon': '🍽️', 'category': 'crew', 'o2_rate': 0.0, 'co2_rate': 0.0},
+    'Medical Bay': {'volume': 16.3, 'color': '#ff9a8b', 'icon': '🏥', 'category': 'critical', 'o2_rate': 0.0, 'co2_rate': 0.0},
+    'Crew Quarters': {'volume': 2.5, 'color': '#a8dadc', 'icon': '🛏️', 'category': 'crew', 'o2_rate': 0.0, 'co2_rate': 0.0},
+    'Exercise Area': {'volume': 35.2, 'color': '#457b9d', 'icon': '🏃', 'category': 'crew', 'o2_rate': 0.0, 'co2_rate': 0.0},
+}
+
+DEFAULT_HABITAT_CONFIG = {
+    'shape': 'cylindrical',
+    'length': 12.0,
+    'diameter': 8.0,
+    'height': 4.0,
+    'crew_size': 6,
+    'mission_duration': 18,  # months
+    'location': 'Mars'
+}
+
+CRITICAL_SYSTEMS = ['Life Support', 'Waste Management', 'Medical Bay', 'Power Systems']
+CREW_O2_RATE = 0.84   # kg/day per person consumed
+CREW_CO2_RATE = 0.82  # kg/day per person produced
+MIN_VOLUME_PER_CREW = 10
+MIN_CORRIDOR_WIDTH = 1.0  # m between module footprints
+FOOTPRINT_SCALE = 8  # canvas px per metre of module footprint
+DAYS_PER_MONTH = 30
+
+
+# =========================
+# PURE FUNCTIONS
+# =========================
+def habitat_volume(shape, length, diameter, height):
+    if shape == 'cylindrical':
+        r = diameter / 2
+        return math.pi * r * r * length
+    elif shape == 'spherical':
+        r = diameter / 2
+        return (4/3) * math.pi * r * r * r
+    elif shape == 'dome':
+        r = diameter / 2
+        return (2/3) * math.pi * r * r * r + math.pi * r * r * height
+    else:
+        return length * diameter * height
+
+
+def compute_volume(module):
+    shape = module.get('shape', 'cube')
+    params = module.get('params', {})
+    count = module.get('count', 1)
+    if shape == 'cube':
+        side = params.get('side', 0)
+        return (side ** 3) * count
+    elif shape == 'sphere':
+        r = params.get('radius', 0)
+        return (4/3 * math.pi * r ** 3) * count
+    elif shape == 'cylinder':
+        r = params.get('radius', 0)
+        h = params.get('height', 0)
+        return (math.pi * r ** 2 * h) * count
+    elif shape == 'hexagonal':
+        side = params.get('side', 0)
+        h = params.get('height', 0)
+        return ((3 * math.sqrt(3) / 2) * side ** 2 * h) * count
+    elif shape == 'triangle':
+        side = params.get('side', 0)
+        h = params.get('height', 0)
+        return ((math.sqrt(3) / 4) * side ** 2 * h) * count
+    else:
+        return NASA_MODULES[module['name']]['volume'] * count
+
+
+def module_footprint_size(module):
+    """Edge length in canvas pixels of the module's drawn footprint."""
+    vol = compute_volume(module)
+    eq_side = vol ** (1/3) if vol > 0 else 1
+    return max(20, eq_side * FOOTPRINT_SCALE)
+
+
+def module_outline(module, x=None, y=None):
+    """Footprint of a placed module as drawn on the layout canvas.
+
+    Returns (kind, coords) where kind is 'polygon', 'oval' or 'rectangle'
+    and coords are flat canvas coordinates centred on (x, y), defaulting to
+    the module's own position.
+    """
+    x = module['x'] if x is None else x
+    y = module['y'] if y is None else y
+    half = module_footprint_size(module) / 2
+    shape = module.get('shape', 'cube')
+    if shape in ('hexagonal', 'triangle'):
+        if shape == 'hexagonal':
+            angles = [math.radians(60 * i) for i in range(6)]
+        else:
+            angles = [math.radians(120 * i - 90) for i in range(3)]  # Start from top
+        vertices = []
+        for angle in angles:
+            vertices.extend([x + half * math.cos(angle), y + half * math.sin(angle)])
+        return 'polygon', vertices
+    if shape == 'sphere':
+        return 'oval', [x - half, y - half, x + half, y + half]
+    # cube, cylinder (drawn as a rectangle) or default
+    return 'rectangle', [x - half, y - half, x + half, y + half]
+
+
+def module_bounds(module, margin=0):
+    """Axis-aligned box (x1, y1, x2, y2) around a placed module's footprint."""
+    half = module_footprint_size(module) / 2 + margin
+    return (module['x'] - half, module['y'] - half, module['x'] + half, module['y'] + half)
+
+
+# =========================
+# MODEL
+# =========================
+class HabitatModel:
+    """Owns one habitat configuration plus its placed modules.
+
+    Module-dependent totals (used volume, summed gas rates, per-name counts)
+    are kept as running sums, so statistics are O(1) to read. Mutate through
+    add_module / remove_module / update_module / set_config so the totals
+    stay in sync and subscribers get notified; call recompute() after
+    editing `modules` or `config` directly.
+
+    Every placed module carries a stable integer 'id' that survives
+    deletions of other modules (list indices do not).
+    """
+
+    def __init__(self, config=None, modules=None):
+        self.config = dict(DEFAULT_HABITAT_CONFIG)
+        if config:
+            self.config.update(config)
+        self.modules = list(modules) if modules is not None else []
+        self._listeners = []
+        self._next_id = 1
+        self.recompute()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a model from the designer's exported JSON layout."""
+        return cls(data.get('habitat', {}), data.get('modules', []))
+
+    def to_dict(self):
+        return {'habitat': dict(self.config), 'modules': list(self.modules)}
+
+    # ---- change tracking ----
+    def subscribe(self, callback):
+        """Call `callback(model)` after every mutation."""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self):
+        for callback in list(self._listeners):
+            callback(self)
+
+    def _account(self, module, sign):
+        mod_data = NASA_MODULES[module['name']]
+        count = module.get('count', 1)
+        self._used_volume += sign * compute_volume(module)
+        self._o2_rate += sign * mod_data['o2_rate'] * count
+        self._co2_rate += sign * mod_data['co2_rate'] * count
+        if module['name'] == 'Food Storage':
+            self._food_volume += sign * mod_data['volume'] * count
+        self._name_counts[module['name']] = self._name_counts.get(module['name'], 0) + sign
+        if module['name'] == 'Crew Quarters':
+            self._crew_quarters += sign * count
+
+    def _assign_id(self, module):
+        module_id = module.get('id')
+        if not isinstance(module_id, int) or module_id in self._by_id:
+            module_id = module['id'] = self._next_id
+        self._next_id = max(self._next_id, module_id + 1)
+        self._by_id[module_id] = module
+
+    def recompute(self):
+        self._used_volume = 0.0
+        self._o2_rate = 0.0
+        self._co2_rate = 0.0
+        self._food_volume = 0.0
+        self._crew_quarters = 0
+        self._name_counts = {}
+        self._by_id = {}
+        for module in self.modules:
+            self._assign_id(module)
+            self._account(module, +1)
+        self._notify()
+
+    def get_module(self, module_id):
+        return self._by_id.get(module_id)
+
+    # ---- mutations ----
+    def add_module(self, module):
+        self._assign_id(module)
+        self.modules.append(module)
+        self._account(module, +1)
+        self._notify()
+        return module
+
+    def remove_module(self, module_id):
+        """Remove and return the module with `module_id`; None if it is already gone."""
+        module = self._by_id.pop(module_id, None)
+        if module is None:
+            return None
+        index = next(i for i, m in enumerate(self.modules) if m is module)
+        del self.modules[index]
+        self._account(module, -1)
+        if not self.modules:
+            self._used_volume = self._o2_rate = self._co2_rate = self._food_volume = 0.0
+        self._notify()
+        return module
+
+    def update_module(self, module, **changes):
+        """Apply `changes` to a placed module, adjusting totals by the delta."""
+        self._account(module, -1)
+        module.update(changes)
+        self._account(module, +1)
+        self._notify()
+
+    def set_config(self, key, value):
+        if self.config.get(key) != value:
+            self.config[key] = value
+            self._notify()
+
+    def update_config(self, values):
+        self.config.update(values)
+        self._notify()
+
+    def clear(self):
+        self.modules.clear()
+        self.recompute()
+
+    def load(self, config, modules):
+        """Replace config and modules in place (keeps outside references valid)."""
+        self.config.update(config)
+        self.modules[:] = modules
+        self.recompute()
+
+    # ---- statistics ----
+    def habitat_volume(self):
+        c = self.config
+        return habitat_volume(c['shape'], c['length'], c['diameter'], c['height'])
+
+    def used_volume(self):
+        return self._used_volume
+
+    def utilization(self):
+        total = self.habitat_volume()
+        used = self.used_volume()
+        return (used / total * 100) if total > 0 else 0
+
+    def volume_per_crew(self):
+        return self.habitat_volume() / max(1, self.config['crew_size'])
+
+    def life_support_rates(self):
+        """Module O2/CO2 rates (kg/day) and Food Storage volume, from the running totals."""
+        return {'o2_rate': self._o2_rate, 'co2_rate': self._co2_rate, 'food_volume': self._food_volume}
+
+    def gas_stats(self):
+        crew_size = self.config['crew_size']
+        mission_days = self.config['mission_duration'] * DAYS_PER_MONTH
+
+        # Crew consumption/production plus module contributions
+        o2_total = (self._o2_rate - crew_size * CREW_O2_RATE) * mission_days
+        co2_total = (self._co2_rate + crew_size * CREW_CO2_RATE) * mission_days
+
+        return {
+            'o2_total': o2_total,
+            'co2_total': co2_total,
+            'o2_per_day': o2_total / mission_days if mission_days > 0 else 0,
+            'co2_per_day': co2_total / mission_days if mission_days > 0 else 0
+        }
+
+    def validate(self, check_layout=True):
+        """List of human-readable design issues; empty when the design is valid.
+
+        With check_layout, modules that have canvas coordinates are also
+        checked for footprint overlap and minimum corridor width.
+        """
+        issues = []
+        crew_size = self.config['crew_size']
+        vol_per_crew = self.volume_per_crew()
+        if vol_per_crew < MIN_VOLUME_PER_CREW:
+            issues.append(f"Volume per crew: {vol_per_crew:.1f} m³ (min: {MIN_VOLUME_PER_CREW} m³)")
+        for system in CRITICAL_SYSTEMS:
+            if not self._name_counts.get(system):
+                issues.append(f"Missing critical system: {system}")
+        crew_quarters = self._crew_quarters
+        if crew_quarters < crew_size:
+            issues.append(f"Crew Quarters: {crew_quarters}/{crew_size} needed")
+        gas_stats = self.gas_stats()
+        if gas_stats['o2_total'] < 0:
+            issues.append(f"Oxygen deficit: {abs(gas_stats['o2_total']):.1f} kg over mission duration")
+        if gas_stats['co2_total'] > 0:
+            issues.append(f"CO2 excess: {gas_stats['co2_total']:.1f} kg over mission duration")
+        if check_layout:
+            from layout_checks import layout_issues  # layout_checks imports this module
+            issues.extend(layout_issues(self.modules))
+        return issues
+
+    def statistics(self):
+        """Same payload the designer writes under 'statistics' on export."""
+        return {
+            'total_volume': self.habitat_volume(),
+            'used_volume': self.used_volume(),
+            'utilization': self.utilization(),
+            'gas_stats': self.gas_stats()
+        }
@@ -0,0 +1,106 @@
+"""Persistent HTTP response cache (SQLite).
+
+Stores response bodies with their ETag / Last-Modified validators and the
+time they were fetched. The freshness policy (TTLs, stale-while-revalidate,
+offline mode) lives in nasa_client; this module only stores rows, counts
+what happened to them and, given a max_age and/or max_rows, prunes the
+oldest ones when opened and every PRUNE_EVERY writes.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_DIR = os.environ.get("POLIN_CACHE_DIR",
+                           os.path.join(os.path.expanduser("~"), ".cache", "polin_habitat"))
+
+PRUNE_EVERY = 200   # writes between prunes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_fetched_at ON responses (fetched_at);
+"""
+
+
+class HttpCache:
+    """Thread-safe key -> (body, etag, last_modified, fetched_at) store."""
+
+    def __init__(self, path=None, max_age=None, max_rows=None):
+        self.path = path or os.path.join(CACHE_DIR, "http.sqlite")
+        self.max_age = max_age
+        self.max_rows = max_rows
+        self._writes = 0
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stale': 0, 'offline': 0, 'errors': 0}
+        self.prune()
+
+    def count(self, what):
+        with self._lock:
+            self.stats[what] += 1
+
+    def get(self, key):
+        """{'body', 'etag', 'last_modified', 'fetched_at'} or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return {'body': row[0], 'etag': row[1], 'last_modified': row[2], 'fetched_at': row[3]}
+
+    def put(self, key, body, etag=None, last_modified=None, fetched_at=None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, body, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(body), etag, last_modified, fetched_at or time.time()))
+            self._db.commit()
+            self._writes += 1
+            due = self._writes % PRUNE_EVERY == 0
+        if due:
+            self.prune()
+
+    def touch(self, key, fetched_at=None):
+        """Mark an entry fresh again (after a 304 Not Modified)."""
+        with self._lock:
+            self._db.execute("UPDATE responses SET fetched_at = ? WHERE key = ?",
+                             (fetched_at or time.time(), key))
+            self._db.commit()
+
+    def prune(self, now=None):
+        """Drop entries older than max_age, then the oldest beyond max_rows.
+
+        Returns the number of rows deleted.
+        """
+        deleted = 0
+        with self._lock:
+            if self.max_age is not None:
+                deleted += self._db.execute("DELETE FROM responses WHERE fetched_at < ?",
+                                            ((now or time.time()) - self.max_age,)).rowcount
+            if self.max_rows is not None:
+                deleted += self._db.execute(
+                    "DELETE FROM responses WHERE key NOT IN "
+                    "(SELECT key FROM responses ORDER BY fetched_at DESC LIMIT ?)",
+                    (self.max_rows,)).rowcount
+            self._db.commit()
+        return deleted
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
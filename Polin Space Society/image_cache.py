@@ -0,0 +1,176 @@
+"""Two-level cache of downloaded, decoded and scaled NASA images.
+
+Level 1 is an in-memory LRU of ready PIL images bounded by a byte budget
+(width * height * bands). Level 2 is a directory of pre-scaled variants on
+disk, keyed by URL, target size and fit mode, bounded by its own byte
+budget and evicted least-recently-used (by file mtime). Only a miss in
+both downloads and decodes the full-resolution original.
+
+PIL images are returned rather than PhotoImages, so lookups can run on
+worker threads; wrap the result in ImageTk.PhotoImage on the Tk thread.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from PIL import Image
+
+import nasa_client
+from http_cache import CACHE_DIR
+
+MEMORY_BUDGET = 64 * 1024 * 1024
+DISK_BUDGET = 256 * 1024 * 1024
+
+
+def _image_bytes(img):
+    return img.width * img.height * len(img.getbands())
+
+
+def scale(img, size, fit="thumbnail"):
+    """'thumbnail' keeps the aspect ratio within size; 'resize' stretches to it."""
+    if fit == "resize":
+        return img.resize(size, Image.Resampling.LANCZOS)
+    img = img.copy()
+    img.thumbnail(size, Image.Resampling.LANCZOS)
+    return img
+
+
+class ImageCache:
+    def __init__(self, directory=None, memory_budget=MEMORY_BUDGET, disk_budget=DISK_BUDGET,
+                 fetch=nasa_client.get_bytes):
+        self.directory = directory or os.path.join(CACHE_DIR, "images")
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self._fetch = fetch
+        self._lru = OrderedDict()   # key -> PIL image
+        self._memory_used = 0
+        self._disk_used = None      # measured on first write
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def _key(self, url, size, fit):
+        return hashlib.sha1(f"{url}|{size[0]}x{size[1]}|{fit}".encode()).hexdigest()
+
+    def _path(self, key, ext):
+        return os.path.join(self.directory, f"{key}.{ext}")
+
+    # --- memory level ---
+    def _remember(self, key, img):
+        with self._lock:
+            old = self._lru.pop(key, None)
+            if old is not None:
+                self._memory_used -= _image_bytes(old)
+            self._lru[key] = img
+            self._memory_used += _image_bytes(img)
+            while self._memory_used > self.memory_budget and len(self._lru) > 1:
+                _, evicted = self._lru.popitem(last=False)
+                self._memory_used -= _image_bytes(evicted)
+
+    def _recall(self, key):
+        with self._lock:
+            img = self._lru.get(key)
+            if img is not None:
+                self._lru.move_to_end(key)
+                self.stats['memory_hits'] += 1
+            return img
+
+    # --- disk level ---
+    def _load_disk(self, key):
+        for ext in ("jpg", "png"):
+            path = self._path(key, ext)
+            try:
+                with Image.open(path) as f:
+                    img = f.copy()
+            except (OSError, ValueError):
+                continue
+            try:
+                os.utime(path)  # mark recently used for eviction
+            except OSError:
+                pass
+            return img
+        return None
+
+    def _store_disk(self, key, img):
+        os.makedirs(self.directory, exist_ok=True)
+        ext = "png" if img.mode in ("RGBA", "LA", "P") else "jpg"
+        path = self._path(key, ext)
+        tmp = path + ".tmp"
+        try:
+            if ext == "jpg":
+                img.convert("RGB").save(tmp, "JPEG", quality=92)
+            else:
+                img.save(tmp, "PNG")
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Image cache write failed: {e}")
+            return
+        with self._lock:
+            if self._disk_used is None:
+                self._disk_used = sum(e.stat().st_size for e in os.scandir(self.directory) if e.is_file())
+            else:
+                self._disk_used += os.path.getsize(path)
+            over = self._disk_used > self.disk_budget
+        if over:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        with self._lock:
+            entries = []
+            for e in os.scandir(self.directory):
+                if e.is_file():
+                    st = e.stat()
+                    entries.append((st.st_mtime, st.st_size, e.path))
+            entries.sort()
+            used = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if used <= self.disk_budget * 0.9:
+                    break
+                try:
+                    os.remove(path)
+                    used -= size
+                except OSError:
+                    continue
+            self._disk_used = used
+
+    # --- public ---
+    def get(self, url, size, fit="thumbnail"):
+        """The image at `url` scaled to `size`; downloads only on a full miss."""
+        key = self._key(url, size, fit)
+        img = self._recall(key)
+        if img is not None:
+            return img
+        img = self._load_disk(key)
+        if img is not None:
+            self.stats['disk_hits'] += 1
+        else:
+            self.stats['misses'] += 1
+            with Image.open(BytesIO(self._fetch(url))) as original:
+                original.draft("RGB", size)  # JPEG: decode at reduced scale when possible
+                img = scale(original, size, fit)
+            self._store_disk(key, img)
+        self._remember(key, img)
+        return img
+
+    def clear_memory(self):
+        with self._lock:
+            self._lru.clear()
+            self._memory_used = 0
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ImageCache()
+        return _default
+
+
+def load_image(url, size, fit="thumbnail"):
+    """Scaled PIL image for `url` from the shared two-level cache."""
+    return default_cache().get(url, size, fit)
@@ -0,0 +1,176 @@
+"""Footprint overlap and corridor-clearance checks for placed modules.
+
+Broad phase: sweep-and-prune over the modules' bounding boxes along x (for
+whole-layout validation) or a SpatialIndex lookup (for re-checking just the
+module being dragged). Narrow phase: exact distance between the convex
+footprints that module_outline draws - hexagons, triangles, rectangles
+and circles. All coordinates are canvas pixels; clearance is converted
+from metres with FOOTPRINT_SCALE.
+"""
+import math
+
+from habitat_model import (FOOTPRINT_SCALE, MIN_CORRIDOR_WIDTH,
+                           module_bounds, module_outline)
+
+MAX_REPORTED = 10
+
+
+# =========================
+# GEOMETRY
+# =========================
+def footprint(module, x=None, y=None):
+    """('circle', (cx, cy), r) or ('polygon', [(x, y), ...]) for a module."""
+    kind, c = module_outline(module, x, y)
+    if kind == 'oval':
+        return 'circle', ((c[0] + c[2]) / 2, (c[1] + c[3]) / 2), (c[2] - c[0]) / 2
+    if kind == 'rectangle':
+        return 'polygon', [(c[0], c[1]), (c[2], c[1]), (c[2], c[3]), (c[0], c[3])]
+    return 'polygon', list(zip(c[0::2], c[1::2]))
+
+
+def _project(points, ax, ay):
+    dots = [px * ax + py * ay for px, py in points]
+    return min(dots), max(dots)
+
+
+def _polygons_overlap(p, q):
+    # Separating axis theorem; touching edges do not count as overlap.
+    for poly in (p, q):
+        n = len(poly)
+        for i in range(n):
+            x1, y1 = poly[i]
+            x2, y2 = poly[(i + 1) % n]
+            ax, ay = y1 - y2, x2 - x1
+            amin, amax = _project(p, ax, ay)
+            bmin, bmax = _project(q, ax, ay)
+            if amax <= bmin or bmax <= amin:
+                return False
+    return True
+
+
+def _point_segment_distance(px, py, ax, ay, bx, by):
+    dx, dy = bx - ax, by - ay
+    length2 = dx * dx + dy * dy
+    t = 0.0 if length2 == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length2))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def _point_polygon_distance(px, py, poly):
+    n = len(poly)
+    return min(_point_segment_distance(px, py, *poly[i], *poly[(i + 1) % n]) for i in range(n))
+
+
+def _point_in_polygon(px, py, poly):
+    n = len(poly)
+    sign = 0
+    for i in range(n):
+        x1, y1 = poly[i]
+        x2, y2 = poly[(i + 1) % n]
+        cross = (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1)
+        if cross != 0:
+            if sign == 0:
+                sign = 1 if cross > 0 else -1
+            elif (cross > 0) != (sign > 0):
+                return False
+    return True
+
+
+def separation(a, b):
+    """(overlap, gap) between two footprints; gap is 0 when they overlap."""
+    if a[0] == 'circle' and b[0] == 'circle':
+        (ax, ay), ar = a[1], a[2]
+        (bx, by), br = b[1], b[2]
+        gap = math.hypot(ax - bx, ay - by) - ar - br
+        return gap < 0, max(0.0, gap)
+    if a[0] == 'circle' or b[0] == 'circle':
+        circle, poly = (a, b) if a[0] == 'circle' else (b, a)
+        (cx, cy), r = circle[1], circle[2]
+        if _point_in_polygon(cx, cy, poly[1]):
+            return True, 0.0
+        gap = _point_polygon_distance(cx, cy, poly[1]) - r
+        return gap < 0, max(0.0, gap)
+    p, q = a[1], b[1]
+    if _polygons_overlap(p, q):
+        return True, 0.0
+    gap = min(min(_point_polygon_distance(x, y, q) for x, y in p),
+              min(_point_polygon_distance(x, y, p) for x, y in q))
+    return False, gap
+
+
+# =========================
+# BROAD PHASE + CHECKS
+# =========================
+def _placed(modules):
+    return [m for m in modules if 'x' in m and 'y' in m]
+
+
+def _narrow(a, b, clearance, shapes):
+    fa = shapes.get(id(a))
+    if fa is None:
+        fa = shapes[id(a)] = footprint(a)
+    fb = shapes.get(id(b))
+    if fb is None:
+        fb = shapes[id(b)] = footprint(b)
+    overlap, gap = separation(fa, fb)
+    if overlap:
+        return ('overlap', a, b, 0.0)
+    if gap < clearance:
+        return ('clearance', a, b, gap)
+    return None
+
+
+def find_conflicts(modules, clearance=MIN_CORRIDOR_WIDTH * FOOTPRINT_SCALE):
+    """All overlapping or too-close module pairs, via sweep-and-prune on x.
+
+    Returns a list of (kind, module_a, module_b, gap_px) with kind
+    'overlap' or 'clearance'.
+    """
+    boxes = sorted(((module_bounds(m), m) for m in _placed(modules)), key=lambda t: t[0][0])
+    shapes = {}
+    conflicts = []
+    active = []
+    for box, module in boxes:
+        # Drop boxes that end (plus clearance) before this one starts
+        active = [(b, m) for b, m in active if b[2] + clearance > box[0]]
+        for other_box, other in active:
+            if other_box[1] - clearance < box[3] and box[1] - clearance < other_box[3]:
+                hit = _narrow(other, module, clearance, shapes)
+                if hit:
+                    conflicts.append(hit)
+        active.append((box, module))
+    return conflicts
+
+
+def conflicts_for(module, index, lookup, clearance=MIN_CORRIDOR_WIDTH * FOOTPRINT_SCALE):
+    """Conflicts involving one module only, using a SpatialIndex of the others.
+
+    `lookup(key)` maps an index key back to its module. Used to re-check the
+    module being dragged without re-validating the whole layout.
+    """
+    x1, y1, x2, y2 = module_bounds(module)
+    conflicts = []
+    shapes = {}
+    for key in index.query_rect(x1 - clearance, y1 - clearance, x2 + clearance, y2 + clearance):
+        other = lookup(key)
+        if other is None or other is module:
+            continue
+        hit = _narrow(module, other, clearance, shapes)
+        if hit:
+            conflicts.append(hit)
+    return conflicts
+
+
+def layout_issues(modules, clearance=MIN_CORRIDOR_WIDTH * FOOTPRINT_SCALE):
+    """validate()-style messages for overlaps and narrow corridors."""
+    issues = []
+    conflicts = find_conflicts(modules, clearance)
+    for kind, a, b, gap in conflicts[:MAX_REPORTED]:
+        names = f"{a['name']} #{a.get('id', '?')} and {b['name']} #{b.get('id', '?')}"
+        if kind == 'overlap':
+            issues.append(f"Modules overlap: {names}")
+        else:
+            issues.append(f"Corridor too narrow: {names} "
+                          f"({gap / FOOTPRINT_SCALE:.1f} m, min: {MIN_CORRIDOR_WIDTH} m)")
+    if len(conflicts) > MAX_REPORTED:
+        issues.append(f"... and {len(conflicts) - MAX_REPORTED} more layout conflicts")
+    return issues
@@ -0,0 +1,236 @@
+"""Automatic module layout by simulated annealing.
+
+Packs the placed modules inside the habitat outline so their footprints do
+not overlap, while keeping the layout compact, preferred neighbours close
+together (ADJACENCY_PREFERENCES) and critical systems grouped. Restarts run
+in parallel in a process pool; auto_layout() reports every improvement
+through `on_improve` so a caller can show the best layout so far.
+
+Footprints are approximated by their bounding squares (module_bounds), so
+a layout with zero overlap here is also overlap-free for the exact shapes.
+"""
+import math
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from habitat_model import (NASA_MODULES, FOOTPRINT_SCALE, MIN_CORRIDOR_WIDTH,
+                           module_footprint_size)
+
+# (module, module, weight): pull these closer together
+ADJACENCY_PREFERENCES = [
+    ('Medical Bay', 'Crew Quarters', 1.0),
+    ('Food Storage', 'Crew Quarters', 0.5),
+    ('Life Support', 'Waste Management', 0.5),
+    ('Exercise Area', 'Medical Bay', 0.3),
+]
+WEIGHTS = {'overlap': 50.0, 'waste': 1.0, 'adjacency': 1.0, 'critical': 0.5}
+
+
+# =========================
+# PROBLEM SPEC + COST
+# =========================
+def build_spec(modules, bounds, clearance=MIN_CORRIDOR_WIDTH * FOOTPRINT_SCALE):
+    """Plain-data description of the packing problem (picklable for workers)."""
+    names = [m['name'] for m in modules]
+    half = np.array([module_footprint_size(m) / 2 for m in modules], dtype=float)
+    adjacency = []
+    for a, b, w in ADJACENCY_PREFERENCES:
+        ia = [i for i, n in enumerate(names) if n == a]
+        ib = [i for i, n in enumerate(names) if n == b]
+        if ia and ib:
+            adjacency.append((np.array(ia), np.array(ib), w))
+    critical = np.array([i for i, n in enumerate(names) if NASA_MODULES[n]['category'] == 'critical'], dtype=int)
+    return {
+        'ids': [m.get('id') for m in modules],
+        'half': half,
+        'bounds': tuple(bounds),
+        'clearance': clearance,
+        'area': float(np.sum((2 * half) ** 2)),
+        'adjacency': adjacency,
+        'critical': critical,
+    }
+
+
+def _overlap_row(i, pos, half, clearance):
+    """Clearance-inflated overlap area between module i and every other module."""
+    reach = half[i] + half + clearance
+    ox = np.clip(reach - np.abs(pos[:, 0] - pos[i, 0]), 0, None)
+    oy = np.clip(reach - np.abs(pos[:, 1] - pos[i, 1]), 0, None)
+    row = ox * oy
+    row[i] = 0.0
+    return row
+
+
+def _total_overlap(pos, half, clearance):
+    reach = half[:, None] + half[None, :] + clearance
+    ox = np.clip(reach - np.abs(pos[:, None, 0] - pos[None, :, 0]), 0, None)
+    oy = np.clip(reach - np.abs(pos[:, None, 1] - pos[None, :, 1]), 0, None)
+    area = ox * oy
+    np.fill_diagonal(area, 0.0)
+    return float(area.sum() / 2)
+
+
+def _soft_cost(pos, spec):
+    """Everything except overlap: wasted area, adjacency and critical grouping."""
+    half = spec['half']
+    area = spec['area']
+    span = np.max(pos + half[:, None], axis=0) - np.min(pos - half[:, None], axis=0)
+    cost = WEIGHTS['waste'] * (span[0] * span[1] - area) / area
+    scale = math.sqrt(area)
+    for ia, ib, w in spec['adjacency']:
+        d = np.hypot(pos[ia, None, 0] - pos[None, ib, 0], pos[ia, None, 1] - pos[None, ib, 1])
+        cost += WEIGHTS['adjacency'] * w * float(d.min(axis=1).sum()) / scale
+    crit = spec['critical']
+    if len(crit) > 1:
+        centre = pos[crit].mean(axis=0)
+        cost += WEIGHTS['critical'] * float(np.hypot(*(pos[crit] - centre).T).sum()) / scale
+    return cost
+
+
+def layout_cost(pos, spec):
+    overlap = _total_overlap(pos, spec['half'], spec['clearance'])
+    return WEIGHTS['overlap'] * overlap / spec['area'] + _soft_cost(pos, spec), overlap
+
+
+# =========================
+# ANNEALING (one restart)
+# =========================
+def _clamp(pos, spec):
+    x1, y1, x2, y2 = spec['bounds']
+    half = spec['half']
+    pos[:, 0] = np.clip(pos[:, 0], x1 + half, np.maximum(x1 + half, x2 - half))
+    pos[:, 1] = np.clip(pos[:, 1], y1 + half, np.maximum(y1 + half, y2 - half))
+    return pos
+
+
+def random_positions(spec, rng):
+    x1, y1, x2, y2 = spec['bounds']
+    n = len(spec['half'])
+    pos = np.column_stack([rng.uniform(x1, x2, n), rng.uniform(y1, y2, n)])
+    return _clamp(pos, spec)
+
+
+def anneal(spec, seed, time_budget, start=None, t0=1.0, t1=1e-3):
+    """Run one annealing restart for `time_budget` seconds.
+
+    Returns (cost, overlap_area, positions as an (n, 2) array).
+    """
+    rng = np.random.default_rng(seed)
+    half = spec['half']
+    n = len(half)
+    clearance = spec['clearance']
+    ow = WEIGHTS['overlap'] / spec['area']
+    x1, y1, x2, y2 = spec['bounds']
+    extent = max(x2 - x1, y2 - y1)
+
+    pos = _clamp(np.array(start, dtype=float) if start is not None else random_positions(spec, rng), spec)
+    overlap = _total_overlap(pos, half, clearance)
+    soft = _soft_cost(pos, spec)
+    cost = ow * overlap + soft
+    best = (cost, overlap, pos.copy())
+    if n < 2:
+        return best
+
+    started = time.perf_counter()
+    temp = t0
+    it = 0
+    while True:
+        if it % 64 == 0:
+            frac = (time.perf_counter() - started) / time_budget
+            if frac >= 1:
+                break
+            temp = t0 * (t1 / t0) ** frac
+        it += 1
+
+        i = rng.integers(n)
+        if rng.random() < 0.15:
+            # Swap two modules (useful for adjacency); recompute both rows
+            j = rng.integers(n)
+            if i == j:
+                continue
+            moved = [i, j]
+            new = pos.copy()
+            new[[i, j]] = pos[[j, i]]
+        else:
+            moved = [i]
+            step = extent * max(temp, 0.02) * 0.5
+            new = pos.copy()
+            new[i] += rng.normal(0, step, 2)
+        _clamp(new, spec)
+
+        delta_overlap = 0.0
+        for k in moved:
+            delta_overlap -= _overlap_row(k, pos, half, clearance).sum()
+            delta_overlap += _overlap_row(k, new, half, clearance).sum()
+        if len(moved) == 2:
+            # the i-j pair was counted twice on both sides
+            a, b = moved
+            delta_overlap += _overlap_row(a, pos, half, clearance)[b]
+            delta_overlap -= _overlap_row(a, new, half, clearance)[b]
+        new_soft = _soft_cost(new, spec)
+        delta = ow * delta_overlap + (new_soft - soft)
+        if delta <= 0 or rng.random() < math.exp(-delta / temp):
+            pos = new
+            overlap = max(0.0, overlap + delta_overlap)
+            soft = new_soft
+            cost = ow * overlap + soft
+            if cost < best[0]:
+                best = (cost, overlap, pos.copy())
+    # Re-evaluate exactly to shed accumulated floating-point drift
+    cost, overlap = layout_cost(best[2], spec)
+    return cost, overlap, best[2]
+
+
+# =========================
+# PARALLEL RESTARTS
+# =========================
+def auto_layout(modules, bounds, time_budget=5.0, restarts=None, seed=None,
+                on_improve=None, should_stop=None, round_budget=1.0):
+    """Pack `modules` inside `bounds` within roughly `time_budget` seconds.
+
+    Each round runs `restarts` annealing runs in parallel: half continue
+    from the best layout so far, half start from random positions. Every
+    improvement is passed to on_improve(result). Returns the best result,
+    a dict with 'cost', 'overlap' and 'positions' ({module id: (x, y)}).
+    """
+    spec = build_spec(modules, bounds)
+    restarts = restarts or os.cpu_count() or 2
+    seeds = np.random.SeedSequence(seed)
+    deadline = time.perf_counter() + time_budget
+    best = None
+
+    def result(cost, overlap, pos):
+        return {'cost': cost, 'overlap': overlap,
+                'positions': {mid: (float(x), float(y)) for mid, (x, y) in zip(spec['ids'], pos)},
+                '_pos': pos}
+
+    ctx = multiprocessing.get_context("spawn")  # never fork a process that owns a Tk interpreter
+    with ProcessPoolExecutor(max_workers=restarts, mp_context=ctx) as pool:
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0.05 or (should_stop and should_stop()):
+                break
+            budget = min(round_budget, remaining)
+            futures = []
+            for k, child in enumerate(seeds.spawn(restarts)):
+                start = best['_pos'] if best is not None and k % 2 == 0 else None
+                futures.append(pool.submit(anneal, spec, child, budget, start, 0.3 if start is not None else 1.0))
+            for future in as_completed(futures):
+                cost, overlap, pos = future.result()
+                if best is None or cost < best['cost']:
+                    best = result(cost, overlap, pos)
+                    if on_improve:
+                        on_improve(best)
+    return best
+
+
+def apply_layout(modules, positions):
+    """Write packed positions back onto module dicts (matched by id)."""
+    for module in modules:
+        xy = positions.get(module.get('id'))
+        if xy is not None:
+            module['x'], module['y'] = xy
@@ -0,0 +1,171 @@
+"""Retained-mode drawing of placed modules on the layout canvas.
+
+Instead of deleting and recreating every canvas item on each change, the
+scene remembers the items it created for each module and only touches the
+ones whose data changed: a moved module is shifted with canvas.move, an
+edited module is rebuilt, everything else is left alone. Entries are keyed
+by the stable module id, and a SpatialIndex over their hit boxes answers
+"which module is under the mouse / inside this rubber band" without asking
+the canvas.
+
+The static background grid is rendered once into an image (grid_photo) and
+shown as a single canvas item, so slider changes only move the habitat
+outline and retitle it.
+"""
+from PIL import Image, ImageDraw, ImageTk
+
+from habitat_model import NASA_MODULES, module_outline, module_bounds
+from spatial_index import SpatialIndex
+
+MODULE_TAG = "module"
+HITBOX_MARGIN = 10
+
+
+def _signature(module):
+    """Everything that affects how a module looks, except its position."""
+    params = module.get('params', {})
+    return (module['name'], module.get('shape', 'cube'), tuple(sorted(params.items())),
+            module.get('count', 1))
+
+
+class _Entry:
+    __slots__ = ('module', 'tag', 'body', 'signature', 'x', 'y')
+
+
+class ModuleScene:
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.index = SpatialIndex()
+        self._entries = {}   # module id -> _Entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ---- building ----
+    def _create(self, module):
+        entry = _Entry()
+        entry.module = module
+        entry.tag = f"module_{module['id']}"
+        self._draw(entry)
+        self._entries[module['id']] = entry
+        return entry
+
+    def _draw(self, entry):
+        c = self.canvas
+        module = entry.module
+        mod_data = NASA_MODULES[module['name']]
+        x, y = module['x'], module['y']
+        tags = (entry.tag, MODULE_TAG)
+        kind, coords = module_outline(module)
+        create = {'polygon': c.create_polygon, 'oval': c.create_oval,
+                  'rectangle': c.create_rectangle}[kind]
+        body = create(coords, fill=mod_data['color'], outline="white", width=2, tags=tags)
+        c.create_text(x, y, text=f"{mod_data['icon']}\n{module['name']}",
+                      fill="white", font=("Arial", 8, "bold"), tags=tags)
+        entry.body = body
+        entry.signature = _signature(module)
+        entry.x, entry.y = x, y
+        # Larger hitbox for easier interaction
+        self.index.insert(module['id'], module_bounds(module, HITBOX_MARGIN))
+
+    def _destroy(self, entry):
+        self.canvas.delete(entry.tag)
+        self.index.remove(entry.module['id'])
+
+    # ---- public API ----
+    def sync(self, modules):
+        """Bring the canvas in line with `modules`, touching only what changed."""
+        seen = set()
+        for module in modules:
+            key = module['id']
+            seen.add(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._create(module)
+            elif entry.module is not module or entry.signature != _signature(module):
+                # A replaced dict (e.g. model.load after an import) may reuse
+                # the id; rebind the entry so hits and moves see the new one
+                self._destroy(entry)
+                entry.module = module
+                self._draw(entry)
+            else:
+                self.move(module)
+        for key in [k for k in self._entries if k not in seen]:
+            self._destroy(self._entries.pop(key))
+
+    def move(self, module):
+        """Shift a module's items to its current x/y without rebuilding them."""
+        entry = self._entries.get(module['id'])
+        if entry is None:
+            return
+        dx, dy = module['x'] - entry.x, module['y'] - entry.y
+        if dx or dy:
+            self.canvas.move(entry.tag, dx, dy)
+            entry.x, entry.y = module['x'], module['y']
+            self.index.update(module['id'], module_bounds(module, HITBOX_MARGIN))
+
+    def highlight(self, module, on=True, color="yellow"):
+        entry = self._entries.get(module['id'])
+        if entry is not None:
+            self.canvas.itemconfig(entry.body, outline=color if on else "white", width=3 if on else 2)
+            if on:
+                self.canvas.tag_raise(entry.tag)
+
+    def module_at(self, x, y):
+        """Module whose hit box contains (x, y); the nearest centre wins ties."""
+        best, best_d = None, None
+        for key in self.index.query_point(x, y):
+            entry = self._entries[key]
+            d = (entry.x - x) ** 2 + (entry.y - y) ** 2
+            if best_d is None or d < best_d:
+                best, best_d = entry.module, d
+        return best
+
+    def modules_in(self, x1, y1, x2, y2):
+        """Modules whose hit box touches the rectangle (rubber-band selection)."""
+        return [self._entries[key].module
+                for key in self.index.query_rect(x1, y1, x2, y2)]
+
+    def clear(self):
+        self.canvas.delete(MODULE_TAG)
+        self._entries.clear()
+        self.index.clear()
+
+
+# =========================
+# CACHED BACKGROUND GRID
+# =========================
+_grid_images = {}   # (width, height, pitch, color, bg, dash) -> PIL image
+_grid_photos = {}   # (grid key, Tk interpreter) -> PhotoImage
+
+
+def _render_grid(width, height, pitch, color, bg, dash):
+    img = Image.new("RGB", (width, height), bg)
+    draw = ImageDraw.Draw(img)
+    on, off = dash if dash else (max(width, height), 0)
+    period = on + off
+    for x in range(0, width, pitch):
+        for y in range(0, height, period):
+            draw.line([(x, y), (x, min(height, y + on) - 1)], fill=color)
+    for y in range(0, height, pitch):
+        for x in range(0, width, period):
+            draw.line([(x, y), (min(width, x + on) - 1, y)], fill=color)
+    return img
+
+
+def grid_photo(widget, width, height, pitch, color, bg, dash=None):
+    """Return a cached PhotoImage of a grid with lines every `pitch` pixels.
+
+    `dash` follows the Tk (on, off) convention. PhotoImages are tied to one
+    Tk interpreter, so the photo cache is keyed by the widget's interpreter
+    while the rendered pixels are shared.
+    """
+    key = (width, height, pitch, color, bg, dash)
+    photo_key = (key, widget.tk)
+    photo = _grid_photos.get(photo_key)
+    if photo is None:
+        img = _grid_images.get(key)
+        if img is None:
+            img = _grid_images[key] = _render_grid(width, height, pitch, color, bg, dash)
+        photo = _grid_photos[photo_key] = ImageTk.PhotoImage(img, master=widget)
+    return photo
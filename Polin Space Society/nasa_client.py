@@ -0,0 +1,236 @@
+"""Shared HTTP client for the NASA Open Data APIs.
+
+One pooled requests.Session keeps TCP/TLS connections to api.nasa.gov and
+the image hosts alive between calls, and a small thread pool lets
+independent endpoints (DONKI flares and CMEs, APOD and rover photos...) be
+fetched in parallel under one overall latency budget.
+
+JSON endpoints that change at most daily are cached on disk (http_cache):
+fresh entries are served without touching the network, entries a little
+past their TTL are served at once and refreshed in the background
+(stale-while-revalidate), expired ones are revalidated with ETag /
+Last-Modified, and in offline mode (set_offline(), or NASA_OFFLINE=1)
+only the cache is used.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import HttpCache
+
+REQUEST_TIMEOUT = 10      # seconds, per request (connect / read)
+LATENCY_BUDGET = 12.0     # seconds, for a whole fetch_all() batch
+MAX_WORKERS = 8
+
+# Seconds a cached JSON response stays fresh, by URL fragment
+CACHE_TTLS = {
+    "/planetary/apod": 3 * 3600,
+    "/DONKI/": 3600,
+    "/mars-photos/": 6 * 3600,
+}
+DATED_APOD_TTL = 30 * 86400       # APOD for a fixed date never changes
+STALE_WHILE_REVALIDATE = 86400    # serve up to a day past TTL while refreshing
+UNCACHED_PARAMS = {"api_key"}
+CACHE_MAX_AGE = 90 * 86400        # offline mode may still use old rows; prune past this
+CACHE_MAX_ROWS = 5000
+
+_session = None
+_executor = None
+_cache = None
+_refreshing = set()
+_offline = os.environ.get("NASA_OFFLINE", "") not in ("", "0")
+_lock = threading.Lock()
+
+
+class OfflineError(requests.ConnectionError):
+    """Raised in offline mode for anything not in the cache."""
+
+
+def session():
+    """The shared, connection-pooling Session (created on first use)."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="nasa")
+        return _executor
+
+
+def get(url, params=None, timeout=REQUEST_TIMEOUT):
+    if _offline:
+        raise OfflineError(f"Offline: {url}")
+    r = session().get(url, params=params, timeout=timeout)
+    r.raise_for_status()
+    return r
+
+
+def get_json(url, params=None, timeout=REQUEST_TIMEOUT, ttl=None):
+    """GET and parse the JSON body once, through the cache for known endpoints.
+
+    `ttl` overrides the CACHE_TTLS lookup; 0 bypasses the cache.
+    """
+    if ttl is None:
+        ttl = _ttl_for(url, params)
+    if not ttl:
+        return get(url, params, timeout).json()
+    return json.loads(_cached_body(url, params, timeout, ttl))
+
+
+def get_bytes(url, params=None, timeout=REQUEST_TIMEOUT):
+    return get(url, params, timeout).content
+
+
+def fetch_all(calls, budget=LATENCY_BUDGET):
+    """Run independent fetches in parallel; {key: result or exception}.
+
+    `calls` maps keys to zero-argument callables (e.g. a lambda around
+    get_json). Anything still running when `budget` seconds have passed is
+    reported as a TimeoutError; its worker finishes in the background.
+    """
+    pool = executor()
+    futures = {key: pool.submit(fn) for key, fn in calls.items()}
+    wait(futures.values(), timeout=budget)
+    results = {}
+    for key, future in futures.items():
+        if not future.done():
+            future.cancel()
+            results[key] = TimeoutError(f"{key}: no response within {budget:.1f} s")
+        elif future.exception() is not None:
+            results[key] = future.exception()
+        else:
+            results[key] = future.result()
+    return results
+
+
+def close():
+    """Close pooled connections and stop the worker threads."""
+    global _session, _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+# =========================
+# RESPONSE CACHE
+# =========================
+def cache():
+    global _cache
+    with _lock:
+        if _cache is None:
+            try:
+                _cache = HttpCache(max_age=CACHE_MAX_AGE, max_rows=CACHE_MAX_ROWS)
+            except (sqlite3.Error, OSError) as e:
+                print(f"HTTP cache unavailable, keeping it in memory: {e}")
+                _cache = HttpCache(":memory:", max_age=CACHE_MAX_AGE, max_rows=CACHE_MAX_ROWS)
+        return _cache
+
+
+def set_offline(offline=True):
+    global _offline
+    _offline = offline
+
+
+def is_offline():
+    return _offline
+
+
+def cache_stats():
+    """Counters: hits, misses, revalidated (304), stale, offline, errors."""
+    return dict(cache().stats)
+
+
+def _ttl_for(url, params):
+    if "/planetary/apod" in url and params and params.get("date"):
+        return DATED_APOD_TTL
+    for fragment, ttl in CACHE_TTLS.items():
+        if fragment in url:
+            return ttl
+    return 0
+
+
+def _cache_key(url, params):
+    kept = sorted((k, v) for k, v in (params or {}).items() if k not in UNCACHED_PARAMS)
+    return f"{url}?{urlencode(kept)}" if kept else url
+
+
+def _fetch(url, params, key, entry, timeout):
+    headers = {}
+    if entry is not None:
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+    r = session().get(url, params=params, timeout=timeout, headers=headers)
+    store = cache()
+    if r.status_code == 304 and entry is not None:
+        store.touch(key)
+        store.count('revalidated')
+        return entry['body']
+    r.raise_for_status()
+    store.put(key, r.content, r.headers.get('ETag'), r.headers.get('Last-Modified'))
+    store.count('misses')
+    return r.content
+
+
+def _revalidate_later(url, params, key, entry, timeout):
+    with _lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            _fetch(url, params, key, entry, timeout)
+        except requests.RequestException as e:
+            print(f"Background refresh failed for {key}: {e}")
+        finally:
+            with _lock:
+                _refreshing.discard(key)
+    executor().submit(refresh)
+
+
+def _cached_body(url, params, timeout, ttl):
+    key = _cache_key(url, params)
+    store = cache()
+    entry = store.get(key)
+    age = time.time() - entry['fetched_at'] if entry is not None else None
+    if entry is not None and age < ttl:
+        store.count('hits')
+        return entry['body']
+    if _offline:
+        if entry is None:
+            raise OfflineError(f"Offline and not cached: {key}")
+        store.count('offline')
+        return entry['body']
+    if entry is not None and age < ttl + STALE_WHILE_REVALIDATE:
+        store.count('stale')
+        _revalidate_later(url, params, key, entry, timeout)
+        return entry['body']
+    try:
+        return _fetch(url, params, key, entry, timeout)
+    except requests.RequestException:
+        if entry is None:
+            raise
+        store.count('errors')  # serve the expired copy rather than nothing
+        return entry['body']
@@ -0,0 +1,154 @@
+"""Monte Carlo reliability of the critical habitat systems.
+
+Each critical system is a group of identical, independently failing units
+(one per placed module of that type) with exponential failure and repair
+times. The function is lost when every unit is down for longer than the
+system's grace period (e.g. how long the crew can ride out a power outage).
+Trials are simulated event by event but vectorized across trials, split
+into fixed-size chunks with their own seeds (so results do not depend on the
+worker count) and run on a process pool.
+
+    python reliability.py --trials 1000000
+"""
+import argparse
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from habitat_model import DAYS_PER_MONTH
+
+# Planning assumptions, in days: mean time between failures, mean time to
+# repair and the outage the crew can tolerate before the function is lost.
+RELIABILITY = {
+    'Life Support': {'mtbf': 180, 'mttr': 2.0, 'grace': 1.0},
+    'Waste Management': {'mtbf': 120, 'mttr': 1.0, 'grace': 3.0},
+    'Medical Bay': {'mtbf': 700, 'mttr': 3.0, 'grace': 7.0},
+    'Power Systems': {'mtbf': 365, 'mttr': 2.0, 'grace': 0.5},
+    'Thermal Control': {'mtbf': 400, 'mttr': 3.0, 'grace': 1.0},
+}
+CHUNK_TRIALS = 100000
+Z_95 = 1.959964
+
+
+def _simulate_system(units, mtbf, mttr, grace, horizon, trials, rng):
+    """Boolean array: did each trial lose this function within `horizon` days?"""
+    if units <= 0:
+        return np.ones(trials, dtype=bool)
+    lam, mu = 1.0 / mtbf, 1.0 / mttr
+    up = np.full(trials, units, dtype=np.int64)
+    t = np.zeros(trials)
+    lost = np.zeros(trials, dtype=bool)
+    active = np.arange(trials)
+    while active.size:
+        u = up[active]
+        rate = u * lam + (units - u) * mu
+        t_next = t[active] + rng.exponential(1.0, active.size) / rate
+        alive = t_next < horizon
+        active, t_next, u, rate = active[alive], t_next[alive], u[alive], rate[alive]
+        t[active] = t_next
+        failure = rng.random(active.size) * rate < u * lam
+        up[active] = u + np.where(failure, -1, 1)
+
+        # Every unit down: the outage lasts until the first repair
+        out = active[up[active] == 0]
+        if out.size:
+            outage = rng.exponential(mttr / units, out.size)
+            lost[out] = np.minimum(outage, horizon - t[out]) > grace
+            t[out] += outage
+            up[out] = 1
+            active = active[~lost[active]]
+    return lost
+
+
+def _run_chunk(task):
+    systems, horizon, trials, seed = task
+    rng = np.random.default_rng(seed)
+    any_lost = np.zeros(trials, dtype=bool)
+    counts = {}
+    for name, (units, mtbf, mttr, grace) in systems.items():
+        lost = _simulate_system(units, mtbf, mttr, grace, horizon, trials, rng)
+        counts[name] = int(np.count_nonzero(lost))
+        any_lost |= lost
+    return counts, int(np.count_nonzero(any_lost))
+
+
+def wilson_interval(failures, trials, z=Z_95):
+    """Wilson score confidence interval for a binomial proportion."""
+    if trials == 0:
+        return 0.0, 1.0
+    p = failures / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def redundancy(modules, default=0):
+    """Units of each critical system in a module list (`default` when absent)."""
+    units = {name: 0 for name in RELIABILITY}
+    for m in modules:
+        if m['name'] in units:
+            units[m['name']] += m.get('count', 1)
+    return {name: n or default for name, n in units.items()}
+
+
+def simulate_reliability(units, mission_days, trials=200000, seed=None, workers=None):
+    """Loss-of-function probabilities for the critical systems.
+
+    `units` maps system names to redundant unit counts (see redundancy()).
+    Returns {'trials': n, 'systems': {name: {'units', 'p', 'ci'}},
+    'any': {'p', 'ci'}} where 'any' is the chance of losing at least one
+    critical function and 'ci' is a 95 % Wilson interval.
+    """
+    systems = {name: (int(units.get(name, 0)), spec['mtbf'], spec['mttr'], spec['grace'])
+               for name, spec in RELIABILITY.items()}
+    sizes = [min(CHUNK_TRIALS, trials - start) for start in range(0, trials, CHUNK_TRIALS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(systems, float(mission_days), n, s) for n, s in zip(sizes, seeds)]
+
+    totals = {name: 0 for name in systems}
+    any_total = 0
+    if len(tasks) > 1 and workers != 1:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            chunks = list(pool.map(_run_chunk, tasks))
+    else:
+        chunks = [_run_chunk(task) for task in tasks]
+    for counts, any_lost in chunks:
+        for name, n in counts.items():
+            totals[name] += n
+        any_total += any_lost
+
+    return {
+        'trials': trials,
+        'systems': {name: {'units': systems[name][0], 'p': totals[name] / max(1, trials),
+                           'ci': wilson_interval(totals[name], trials)}
+                    for name in systems},
+        'any': {'p': any_total / max(1, trials), 'ci': wilson_interval(any_total, trials)},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo loss-of-function estimate for critical systems.")
+    parser.add_argument('--trials', type=int, default=1000000)
+    parser.add_argument('--months', type=int, default=18, help="mission duration")
+    parser.add_argument('--units', type=int, default=2, help="redundant units per critical system")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    result = simulate_reliability({name: args.units for name in RELIABILITY},
+                                  args.months * DAYS_PER_MONTH, args.trials, args.seed, args.workers)
+    elapsed = time.perf_counter() - t0
+    print(f"{args.trials} trials, {args.months} months, {args.units} units each: {elapsed:.2f} s")
+    for name, r in list(result['systems'].items()) + [('Any critical', result['any'])]:
+        lo, hi = r['ci']
+        print(f"{name:>18}: P(loss) = {r['p']:.5f}  [{lo:.5f}, {hi:.5f}]")
+
+
+if __name__ == "__main__":
+    main()
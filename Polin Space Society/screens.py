@@ -0,0 +1,88 @@
+"""Screens swapped inside the one persistent Tk root.
+
+Navigation used to destroy the root, create a new tk.Tk() and start another
+(nested) mainloop for every screen, re-initialising Tcl and losing every
+PhotoImage. A ScreenManager instead keeps each screen as a Frame: the first
+visit builds it, later visits just pack it again, with its images, GIFs and
+loaded NASA pictures intact. Hidden screens are unmapped, so their
+animations pause (animation_clock skips widgets that are not viewable). The
+least recently shown screens beyond `keep` are destroyed.
+
+Every navigation is timed from show() until Tk is next idle after laying out
+the new screen; summary() splits the timings into first visits (built) and
+revisits (cached).
+"""
+import os
+import time
+import tkinter as tk
+from collections import OrderedDict
+
+KEEP_SCREENS = 6
+
+
+class _Screen:
+    __slots__ = ('frame', 'title', 'geometry')
+
+    def __init__(self, frame, title, geometry):
+        self.frame = frame
+        self.title = title
+        self.geometry = geometry
+
+
+class ScreenManager:
+    def __init__(self, root, keep=KEEP_SCREENS):
+        self.root = root
+        self.keep = keep
+        self.current = None
+        self.timings = []   # (key, built, ms)
+        self._screens = OrderedDict()
+
+    def show(self, key, build, title=None, geometry=None, bg=None):
+        """Switch to screen `key`, calling build(frame) only on its first visit."""
+        started = time.perf_counter()
+        screen = self._screens.get(key)
+        built = screen is None or not screen.frame.winfo_exists()
+        if built:
+            frame = tk.Frame(self.root, bg=bg) if bg else tk.Frame(self.root)
+            screen = self._screens[key] = _Screen(frame, title, geometry)
+            build(frame)
+        self._screens.move_to_end(key)
+        if self.current is not None and self.current != key and self.current in self._screens:
+            self._screens[self.current].frame.pack_forget()
+        self.current = key
+        screen.frame.pack(fill="both", expand=True)
+        if screen.title:
+            self.root.title(screen.title)
+        if screen.geometry:
+            self.root.geometry(screen.geometry)
+        self._evict()
+        self.root.after_idle(self._record, key, built, started)
+        return screen.frame
+
+    def forget(self, key):
+        """Drop a cached screen so its next visit rebuilds it."""
+        screen = self._screens.pop(key, None)
+        if screen is not None and key != self.current:
+            screen.frame.destroy()
+
+    def _evict(self):
+        while len(self._screens) > self.keep:
+            key = next(k for k in self._screens if k != self.current)
+            self._screens.pop(key).frame.destroy()
+
+    def _record(self, key, built, started):
+        ms = (time.perf_counter() - started) * 1000
+        self.timings.append((key, built, ms))
+        if os.environ.get("POLIN_DIAGNOSTICS"):
+            print(f"Navigation to {key}: {ms:.1f} ms ({'built' if built else 'cached'})")
+
+    def summary(self):
+        result = {}
+        for name, built in (('built', True), ('cached', False)):
+            times = sorted(ms for _, b, ms in self.timings if b is built)
+            result[name] = {
+                'count': len(times),
+                'mean_ms': sum(times) / len(times) if times else 0.0,
+                'max_ms': times[-1] if times else 0.0,
+            }
+        return result
@@ -0,0 +1,101 @@
+"""Uniform-grid spatial index over axis-aligned bounding boxes.
+
+Keys are arbitrary hashables (the designer uses the stable module ids
+assigned by HabitatModel). Each box is registered in every grid cell it
+touches, so point and rectangle queries only look at the handful of
+entries near the query instead of every placed module.
+"""
+import math
+
+
+class SpatialIndex:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self._cells = {}   # (cx, cy) -> set of keys
+        self._boxes = {}   # key -> (x1, y1, x2, y2)
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __contains__(self, key):
+        return key in self._boxes
+
+    def bbox(self, key):
+        return self._boxes[key]
+
+    def _cell_range(self, x1, y1, x2, y2):
+        cs = self.cell_size
+        return (math.floor(x1 / cs), math.floor(y1 / cs),
+                math.floor(x2 / cs), math.floor(y2 / cs))
+
+    def _cells_of(self, box):
+        cx1, cy1, cx2, cy2 = self._cell_range(*box)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                yield cx, cy
+
+    def insert(self, key, box):
+        if key in self._boxes:
+            self.remove(key)
+        self._boxes[key] = tuple(box)
+        for cell in self._cells_of(box):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        box = self._boxes.pop(key, None)
+        if box is None:
+            return
+        for cell in self._cells_of(box):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._cells[cell]
+
+    def update(self, key, box):
+        old = self._boxes.get(key)
+        if old is not None and self._cell_range(*old) == self._cell_range(*box):
+            self._boxes[key] = tuple(box)  # same cells, nothing to re-bucket
+        else:
+            self.insert(key, box)
+
+    def clear(self):
+        self._cells.clear()
+        self._boxes.clear()
+
+    def query_point(self, x, y):
+        """Keys whose box contains (x, y)."""
+        cs = self.cell_size
+        bucket = self._cells.get((math.floor(x / cs), math.floor(y / cs)), ())
+        hits = []
+        for key in bucket:
+            x1, y1, x2, y2 = self._boxes[key]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                hits.append(key)
+        return hits
+
+    def query_rect(self, x1, y1, x2, y2, contained=False):
+        """Keys whose box intersects (or, with contained=True, lies inside) the rectangle."""
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        candidates = set()
+        cx1, cy1, cx2, cy2 = self._cell_range(x1, y1, x2, y2)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self._cells):
+            # Query covers more cells than are occupied: walk the occupied ones
+            for (cx, cy), bucket in self._cells.items():
+                if cx1 <= cx <= cx2 and cy1 <= cy <= cy2:
+                    candidates |= bucket
+        else:
+            for cell in self._cells_of((x1, y1, x2, y2)):
+                bucket = self._cells.get(cell)
+                if bucket:
+                    candidates |= bucket
+        hits = []
+        for key in candidates:
+            bx1, by1, bx2, by2 = self._boxes[key]
+            if contained:
+                if bx1 >= x1 and by1 >= y1 and bx2 <= x2 and by2 <= y2:
+                    hits.append(key)
+            elif bx1 <= x2 and bx2 >= x1 and by1 <= y2 and by2 >= y1:
+                hits.append(key)
+        return hits
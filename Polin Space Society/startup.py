@@ -0,0 +1,79 @@
+"""Startup timing and lazy module loading.
+
+Imported first by the designer, so its clock starts before any other import.
+lazy_import() returns a stand-in that imports the real module the first
+time one of its attributes is used, which keeps requests, numpy, fpdf and
+the analysis modules out of the path to the first painted frame. With
+profiling enabled (--startup-profile) every phase and every deferred import
+is timed and report() prints the table.
+"""
+import importlib
+import threading
+import time
+
+T0 = time.perf_counter()
+
+enabled = False
+_events = []    # (label, start offset s, duration s, thread name)
+_lock = threading.Lock()
+
+
+def record(label, started, ended=None):
+    """Log a phase that ran from `started` to `ended` (perf_counter values)."""
+    if not enabled:
+        return
+    ended = time.perf_counter() if ended is None else ended
+    with _lock:
+        _events.append((label, started - T0, ended - started, threading.current_thread().name))
+
+
+class phase:
+    """Context manager timing one named startup phase."""
+
+    def __init__(self, label):
+        self.label = label
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.label, self.started)
+        return False
+
+
+class LazyModule:
+    """Module stand-in; the real import happens on first attribute access."""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            started = time.perf_counter()
+            module = importlib.import_module(self._name)
+            self.__dict__['_module'] = module
+            record(f"import {self._name}", started)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__['_module'] is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def report():
+    """Print every recorded phase, in start order."""
+    with _lock:
+        events = sorted(_events, key=lambda e: e[1])
+    print(f"{'phase':<34} {'start ms':>9} {'took ms':>9}  thread")
+    for label, start, took, thread in events:
+        print(f"{label:<34} {start * 1000:9.1f} {took * 1000:9.1f}  {thread}")
@@ -0,0 +1,66 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+import apod_prefetch
+import nasa_client
+
+
+@pytest.fixture
+def prefetcher(monkeypatch):
+    nasa_client.close()
+    queue = apod_prefetch.ApodPrefetcher("KEY", depth=3)
+    queue.calls = 0
+    queue.gate = threading.Event()
+    queue.results = iter(())
+    lock = threading.Lock()
+
+    def fetch_one():
+        with lock:
+            queue.calls += 1
+            n = queue.calls
+        queue.gate.wait(5)
+        return next(queue.results, ({"n": n}, "image"))
+
+    monkeypatch.setattr(queue, "fetch_one", fetch_one)
+    yield queue
+    queue.gate.set()
+    nasa_client.close()
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_first_pop_waits_for_the_refill(prefetcher):
+    pending = prefetcher.pop()
+    assert isinstance(pending, Future)
+    _wait_for(lambda: prefetcher.calls == 3)
+
+    prefetcher.gate.set()
+    data, image = pending.result(timeout=5)
+    assert image == "image"
+    _wait_for(lambda: prefetcher.ready() == 3)
+    # the refill fed the waiting pop and topped the queue back up: one extra fetch, not a fourth in parallel
+    assert prefetcher.calls == 4
+    assert not isinstance(prefetcher.pop(), Future)
+
+
+def test_cancelled_wait_leaves_the_entry_queued(prefetcher):
+    pending = prefetcher.pop()
+    assert pending.cancel()
+    prefetcher.gate.set()
+    _wait_for(lambda: prefetcher.ready() == 3)
+    assert prefetcher.calls == 3
+
+
+def test_failed_download_resolves_the_wait_with_none(prefetcher):
+    prefetcher.results = iter([None, None, None])
+    pending = prefetcher.pop()
+    prefetcher.gate.set()
+    assert pending.result(timeout=5) is None
@@ -0,0 +1,62 @@
+import json
+
+import design_batch
+import design_binary
+
+
+def _designer(**module):
+    return {'habitat': {'shape': 'cylindrical', 'length': 20.0, 'diameter': 10.0, 'height': 4.0,
+                        'crew_size': 2, 'mission_duration': 6},
+            'modules': [dict({'name': 'Life Support', 'shape': 'cube', 'params': {'side': 2.0},
+                              'x': 100, 'y': 100, 'count': 1}, **module)]}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def test_truncated_binary_is_reported_not_raised(tmp_path):
+    good = str(tmp_path / "good.plnd")
+    design_binary.write_design(good, _designer())
+    truncated = tmp_path / "truncated.plnd"
+    truncated.write_bytes(open(good, "rb").read()[:20])
+
+    result = design_batch.check_file(str(truncated))
+    assert not result['valid']
+    assert result['errors']
+
+
+def test_unhashable_module_name_is_a_schema_error(tmp_path):
+    path = _write(tmp_path / "list_name.json", _designer(name=["Life Support"]))
+    result = design_batch.check_file(path)
+    assert result['format'] == 'designer'
+    assert any("unknown module" in e for e in result['errors'])
+
+
+def test_chunk_guard_records_unexpected_errors(tmp_path, monkeypatch):
+    path = _write(tmp_path / "ok.json", _designer())
+
+    def broken(*args):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(design_batch, "check_file", broken)
+    [result] = design_batch._check_chunk(([path], None, None))
+    assert result['errors'] == ["check failed: RuntimeError: boom"]
+    assert not result['valid']
+
+
+def test_batch_summary_survives_bad_files(tmp_path):
+    good = str(tmp_path / "good.plnd")
+    design_binary.write_design(good, _designer())
+    (tmp_path / "truncated.plnd").write_bytes(b"PLNDSGN\0\x01")
+    _write(tmp_path / "list_name.json", _designer(name=[1, 2]))
+    (tmp_path / "broken.json").write_text("{not json")
+    for i in range(design_batch.CHUNK_FILES):   # enough files for a second chunk and the pool
+        _write(tmp_path / f"d{i:02}.json", _designer())
+
+    paths = design_batch.find_designs([str(tmp_path)])
+    for workers in (1, None):
+        summary = design_batch.check_designs(paths, workers=workers)
+        assert summary['files'] == len(paths)
+        assert summary['errors'] == 3
+        assert len(summary['results']) == len(paths)
@@ -0,0 +1,115 @@
+import json
+import struct
+
+import pytest
+
+import design_binary
+from design_binary import DesignFile, load_design, save_design
+
+DESIGN = {
+    'habitat': {'shape': 'cylinder', 'length': 12.5, 'diameter': 6, 'height': 4.0,
+                'crew_size': 4, 'mission_duration': 12},
+    'modules': [
+        {'name': 'Sleep', 'shape': 'cube', 'params': {'side': 2}, 'x': 10, 'y': 20.0, 'count': 2, 'id': 1},
+        {'name': 'Galley', 'shape': 'cylinder', 'params': {'radius': 1.5, 'height': 2},
+         'x': 0.25, 'y': -3, 'id': 2, 'color': 'red', 'tags': ['a', {'b': None}]},
+        {'name': 'Storage', 'shape': 'cube', 'params': {'side': True}, 'x': True, 'y': False, 'id': 3},
+        {'name': 'Lab', 'shape': 'other', 'params': {'radius': 'big'}, 'x': '12', 'y': None, 'id': 4.0},
+        {'name': 7, 'params': {}, 'x': 2 ** 60, 'y': 1e300, 'id': 5},
+        {},
+    ],
+    'version': 2,
+    'notes': 'round trip',
+}
+
+
+def _exact(data):
+    # json.dumps tells 1 from 1.0 from True, unlike ==
+    return json.dumps(data, sort_keys=True)
+
+
+def _round_trip(tmp_path, data):
+    path = str(tmp_path / "d.plnd")
+    save_design(path, data)
+    return load_design(path)
+
+
+def test_round_trip_is_lossless(tmp_path):
+    assert _exact(_round_trip(tmp_path, DESIGN)) == _exact(DESIGN)
+
+
+def test_round_trip_empty_module_list(tmp_path):
+    data = {'habitat': {'shape': 'modular'}, 'modules': []}
+    assert _exact(_round_trip(tmp_path, data)) == _exact(data)
+    with DesignFile(str(tmp_path / "d.plnd")) as design:
+        assert len(design.modules) == 0
+
+
+def test_transient_keys_are_not_saved(tmp_path):
+    data = {'habitat': {}, 'modules': [{'name': 'Sleep', 'x': 1, 'offset_x': 5, 'offset_y': 6}]}
+    assert _round_trip(tmp_path, data)['modules'] == [{'name': 'Sleep', 'x': 1}]
+
+
+def _valid_file(tmp_path):
+    path = str(tmp_path / "d.plnd")
+    save_design(path, DESIGN)
+    with open(path, 'rb') as f:
+        return path, bytearray(f.read())
+
+
+def _rewrite(path, blob):
+    with open(path, 'wb') as f:
+        f.write(blob)
+
+
+def _rewrite_meta(path, blob, edit):
+    magic, version, r1, r2, count, offset, length = design_binary.HEADER.unpack_from(blob, 0)
+    meta = json.loads(bytes(blob[offset:offset + length]))
+    edit(meta)
+    new = json.dumps(meta).encode()
+    _rewrite(path, design_binary.HEADER.pack(magic, version, r1, r2, count, offset, len(new))
+             + blob[design_binary.HEADER.size:offset] + new)
+
+
+@pytest.mark.parametrize("size", [0, 10, design_binary.HEADER.size - 1, design_binary.HEADER.size, 200])
+def test_truncated_file_is_rejected(tmp_path, size):
+    path, blob = _valid_file(tmp_path)
+    _rewrite(path, blob[:size])
+    with pytest.raises(ValueError, match="not a (valid|complete) binary design file"):
+        DesignFile(path)
+
+
+def test_metadata_offset_past_end_is_rejected(tmp_path):
+    path, blob = _valid_file(tmp_path)
+    struct.pack_into("<Q", blob, 24, len(blob) + 100)
+    _rewrite(path, blob)
+    with pytest.raises(ValueError, match="not a complete binary design file"):
+        DesignFile(path)
+
+
+@pytest.mark.parametrize("edit", [
+    lambda meta: meta.pop('columns'),
+    lambda meta: meta['columns'].pop('present'),
+    lambda meta: meta['columns'].__setitem__('x', [10 ** 9, '<f8']),
+    lambda meta: meta['columns'].__setitem__('x', ['64', '<f8']),
+    lambda meta: meta['columns'].__setitem__('x', [64, 'not a dtype']),
+    lambda meta: meta['columns'].__setitem__('name', [64, '<f8']),
+    lambda meta: meta.__setitem__('strings', {}),
+    lambda meta: meta.__setitem__('strings', ['Sleep']),
+    lambda meta: meta.__setitem__('extras', [None]),
+    lambda meta: meta.__setitem__('habitat', [1, 2]),
+])
+def test_malformed_metadata_is_rejected(tmp_path, edit):
+    path, blob = _valid_file(tmp_path)
+    _rewrite_meta(path, blob, edit)
+    with pytest.raises(ValueError, match="not a valid binary design file"):
+        DesignFile(path)
+
+
+def test_garbage_metadata_is_rejected(tmp_path):
+    path, blob = _valid_file(tmp_path)
+    offset = design_binary.HEADER.unpack_from(blob, 0)[5]
+    blob[offset:offset + 4] = b"\xff\xfe{["
+    _rewrite(path, blob)
+    with pytest.raises(ValueError, match="not a valid binary design file"):
+        DesignFile(path)
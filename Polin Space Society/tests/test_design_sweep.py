@@ -0,0 +1,62 @@
+import csv
+from concurrent.futures import Future
+
+import numpy as np
+
+import design_sweep
+
+
+class _InlineExecutor:
+    """Runs each chunk on submit and records how many results are waiting."""
+    instances = []
+
+    def __init__(self, max_workers=None, mp_context=None):
+        self.max_workers = max_workers
+        self.unconsumed = 0
+        self.max_unconsumed = 0
+        _InlineExecutor.instances.append(self)
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        self.unconsumed += 1
+        self.max_unconsumed = max(self.max_unconsumed, self.unconsumed)
+        real_result = future.result
+
+        def result(timeout=None):
+            self.unconsumed -= 1
+            return real_result(timeout)
+        future.result = result
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_pending_chunks_are_bounded(monkeypatch):
+    monkeypatch.setattr(design_sweep, "ProcessPoolExecutor", _InlineExecutor)
+    _InlineExecutor.instances.clear()
+    result = design_sweep.sweep(method='lhs', samples=400, chunk_size=10, workers=2, seed=1)
+
+    assert result['evaluated'] == 400
+    pool, = _InlineExecutor.instances
+    assert pool.max_unconsumed <= design_sweep.MAX_PENDING_PER_WORKER * 2
+
+
+def test_grid_rounds_integer_params(monkeypatch, tmp_path):
+    monkeypatch.setattr(design_sweep, "ProcessPoolExecutor", _InlineExecutor)
+    space = {'length': (3, 50), 'crew_size': (1, 6), 'mission_duration': (1, 60)}
+    out = tmp_path / "grid.csv"
+    result = design_sweep.sweep(space, method='grid', workers=1, output=str(out))
+
+    # 10 lengths x 6 whole crew sizes (1..6, duplicates dropped) x 10 durations
+    assert result['evaluated'] == 10 * 6 * 10
+    with open(out, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 600
+    assert sorted({float(r['crew_size']) for r in rows}) == [1, 2, 3, 4, 5, 6]
+    durations = np.array([float(r['mission_duration']) for r in rows])
+    assert np.array_equal(durations, np.round(durations))
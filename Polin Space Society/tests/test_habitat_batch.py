@@ -0,0 +1,30 @@
+import numpy as np
+
+from habitat_batch import _random_models, evaluate_models, evaluate_shared
+
+
+def test_batch_matches_scalar_model():
+    models = _random_models(2000, seed=7)
+    batch = evaluate_models(models)
+
+    assert np.allclose(batch['total_volume'], [m.habitat_volume() for m in models])
+    assert np.allclose(batch['used_volume'], [m.used_volume() for m in models])
+    assert np.allclose(batch['utilization'], [m.utilization() for m in models])
+    assert np.allclose(batch['volume_per_crew'], [m.volume_per_crew() for m in models])
+    for key in ('o2_total', 'co2_total', 'o2_per_day', 'co2_per_day'):
+        assert np.allclose(batch[key], [m.gas_stats()[key] for m in models])
+    assert (batch['valid'] == [not m.validate(check_layout=False) for m in models]).all()
+
+
+def test_shared_layout_matches_per_design():
+    models = _random_models(50, seed=3)
+    modules = models[0].modules
+    for m in models:
+        m.load({}, [dict(mod) for mod in modules])
+    cfgs = [m.config for m in models]
+    shared = evaluate_shared(*([c[k] for c in cfgs] for k in
+                               ('shape', 'length', 'diameter', 'height', 'crew_size', 'mission_duration')),
+                             modules)
+    per_design = evaluate_models(models)
+    for key in ('used_volume', 'utilization', 'o2_total', 'co2_total', 'valid'):
+        assert np.allclose(shared[key], per_design[key])
@@ -0,0 +1,39 @@
+import pytest
+
+import life_support_sim
+from habitat_model import HabitatModel
+
+
+def _module(name='Life Support', side=2.0):
+    return {'name': name, 'shape': 'cube', 'params': {'side': side}, 'x': 100, 'y': 100, 'count': 1}
+
+
+def test_remove_unknown_id_is_a_no_op():
+    model = HabitatModel(modules=[_module(), _module('Stowage')])
+    calls = []
+    model.subscribe(calls.append)
+    first = model.modules[0]
+
+    assert model.remove_module(first['id']) is first
+    used = model.used_volume()
+    assert model.remove_module(first['id']) is None
+    assert model.remove_module(999) is None
+    assert model.used_volume() == used
+    assert len(model.modules) == 1
+    assert len(calls) == 1
+
+
+def test_life_support_rates_track_edits():
+    model = HabitatModel()
+    sleep = model.add_module(dict(_module('Crew Quarters'), count=2))
+    food = model.add_module(dict(_module('Food Storage'), count=3))
+    model.add_module(_module())
+    model.update_module(food, count=1)
+    model.remove_module(sleep['id'])
+
+    rates = model.life_support_rates()
+    expected = life_support_sim.life_support_rates(model.modules)
+    assert rates == pytest.approx(expected)
+    assert rates['food_volume'] > 0
+    sim = life_support_sim.simulate(model.config, model.modules, rates=rates)
+    assert sim['min_o2'] == life_support_sim.simulate(model.config, model.modules)['min_o2']
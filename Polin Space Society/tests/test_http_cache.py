@@ -0,0 +1,39 @@
+import time
+
+import http_cache
+from http_cache import HttpCache
+
+
+def _keys(cache):
+    return {row[0] for row in cache._db.execute("SELECT key FROM responses")}
+
+
+def test_prune_on_open_drops_old_and_excess_rows(tmp_path):
+    path = str(tmp_path / "http.sqlite")
+    now = time.time()
+    cache = HttpCache(path)
+    cache.put("ancient", b"{}", fetched_at=now - 100 * 86400)
+    for i in range(5):
+        cache.put(f"k{i}", b"{}", fetched_at=now - i)
+    cache.close()
+
+    cache = HttpCache(path, max_age=30 * 86400, max_rows=3)
+    assert _keys(cache) == {"k0", "k1", "k2"}
+    cache.close()
+
+
+def test_prune_runs_every_n_writes(monkeypatch):
+    monkeypatch.setattr(http_cache, "PRUNE_EVERY", 10)
+    cache = HttpCache(":memory:", max_rows=4)
+    for i in range(9):
+        cache.put(f"k{i}", b"{}", fetched_at=1000 + i)
+    assert len(_keys(cache)) == 9
+    cache.put("k9", b"{}", fetched_at=1009)
+    assert _keys(cache) == {"k6", "k7", "k8", "k9"}
+
+
+def test_no_limits_keeps_everything():
+    cache = HttpCache(":memory:")
+    cache.put("old", b"{}", fetched_at=1)
+    assert cache.prune() == 0
+    assert cache.get("old")["body"] == b"{}"
@@ -0,0 +1,73 @@
+from layout_scene import ModuleScene
+
+
+class FakeCanvas:
+    """Records items by tag; enough of tk.Canvas for ModuleScene."""
+
+    def __init__(self):
+        self.items = {}
+        self._next = 1
+
+    def _create(self, *args, tags=(), **kwargs):
+        item = self._next
+        self._next += 1
+        self.items[item] = set(tags)
+        return item
+
+    create_polygon = create_oval = create_rectangle = create_text = _create
+
+    def delete(self, tag):
+        self.items = {i: t for i, t in self.items.items() if tag not in t}
+
+    def move(self, tag, dx, dy):
+        pass
+
+    def itemconfig(self, item, **kwargs):
+        pass
+
+    def tag_raise(self, tag):
+        pass
+
+
+def _modules():
+    return [
+        {'id': 1, 'name': 'Life Support', 'shape': 'cube', 'params': {'side': 2.0}, 'x': 100, 'y': 100, 'count': 1},
+        {'id': 2, 'name': 'Stowage', 'shape': 'sphere', 'params': {'radius': 1.5}, 'x': 300, 'y': 200, 'count': 1},
+    ]
+
+
+def test_resync_with_new_dicts_rebinds_entries():
+    canvas = FakeCanvas()
+    scene = ModuleScene(canvas)
+    scene.sync(_modules())
+
+    # Re-importing an export: same ids and content, but new dict objects
+    reloaded = _modules()
+    reloaded[1]['x'] = 500
+    scene.sync(reloaded)
+
+    assert len(scene) == 2
+    assert scene.module_at(100, 100) is reloaded[0]
+    assert scene.module_at(500, 200) is reloaded[1]
+    assert scene.module_at(300, 200) is None
+    hits = scene.modules_in(0, 0, 600, 400)
+    assert len(hits) == 2 and all(any(m is r for r in reloaded) for m in hits)
+    # One body and one label per module, the old items were removed
+    assert len(canvas.items) == 4
+
+    # Moves now follow the new dicts
+    reloaded[0]['x'] = 150
+    scene.move(reloaded[0])
+    assert scene.module_at(150, 100) is reloaded[0]
+
+
+def test_resync_same_dicts_only_moves():
+    canvas = FakeCanvas()
+    scene = ModuleScene(canvas)
+    modules = _modules()
+    scene.sync(modules)
+    items = dict(canvas.items)
+    modules[0]['x'] = 120
+    scene.sync(modules)
+    assert canvas.items == items
+    assert scene.module_at(120, 100) is modules[0]
@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import nasa_client
+from http_cache import HttpCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so connection reuse is visible
+
+    def do_GET(self):
+        server = self.server
+        query = parse_qs(urlparse(self.path).query)
+        with server.lock:
+            server.requests.append(self.path)
+            server.connections.add(self.client_address)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(float(query.get("delay", ["0"])[0]))
+            body = json.dumps({"path": self.path}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.connections = set()
+    httpd.in_flight = httpd.max_in_flight = 0
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    nasa_client.close()
+    monkeypatch.setattr(nasa_client, "_cache", HttpCache(":memory:"))
+    monkeypatch.setattr(nasa_client, "_offline", False)
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    nasa_client.close()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_all_runs_requests_in_parallel(server):
+    calls = {i: (lambda i=i: nasa_client.get_json(f"{server.url}/p{i}", {"delay": 0.4}, ttl=0))
+             for i in range(4)}
+    started = time.perf_counter()
+    results = nasa_client.fetch_all(calls, budget=5)
+    elapsed = time.perf_counter() - started
+
+    assert all(results[i] == {"path": f"/p{i}?delay=0.4"} for i in range(4))
+    assert server.max_in_flight == 4
+    assert elapsed < 1.2   # sequentially this takes 1.6 s
+
+
+def test_each_response_is_parsed_once(server, monkeypatch):
+    parses = []
+    real_loads = json.loads
+    monkeypatch.setattr(nasa_client.json, "loads", lambda body: parses.append(body) or real_loads(body))
+
+    calls = {i: (lambda i=i: nasa_client.get_json(f"{server.url}/DONKI/FLR", {"n": i}))
+             for i in range(3)}
+    results = nasa_client.fetch_all(calls, budget=5)
+    assert [results[i]["path"] for i in range(3)] == [f"/DONKI/FLR?n={i}" for i in range(3)]
+    assert len(server.requests) == 3
+    assert len(parses) == 3
+
+    # A cache hit parses the stored body once and does not touch the network
+    assert nasa_client.get_json(f"{server.url}/DONKI/FLR", {"n": 0}) == results[0]
+    assert len(server.requests) == 3
+    assert len(parses) == 4
+
+
+def test_connections_are_reused(server):
+    for i in range(10):
+        nasa_client.get_json(f"{server.url}/seq{i}", ttl=0)
+    assert len(server.connections) == 1
+
+    for _ in range(3):
+        nasa_client.fetch_all({i: (lambda i=i: nasa_client.get_json(f"{server.url}/par{i}", ttl=0))
+                               for i in range(nasa_client.MAX_WORKERS)}, budget=5)
+    assert len(server.requests) == 10 + 3 * nasa_client.MAX_WORKERS
+    assert len(server.connections) <= nasa_client.MAX_WORKERS
+
+
+def test_budget_drops_and_cancels_late_requests(server, monkeypatch):
+    # One worker: "queued" cannot start before "slow" finishes, so the
+    # deadline must cancel it outright; "slow" is reported and dropped.
+    monkeypatch.setattr(nasa_client, "MAX_WORKERS", 1)
+    calls = {
+        "slow": lambda: nasa_client.get_json(f"{server.url}/slow", {"delay": 1.0}, ttl=0),
+        "queued": lambda: nasa_client.get_json(f"{server.url}/queued", ttl=0),
+    }
+    started = time.perf_counter()
+    results = nasa_client.fetch_all(calls, budget=0.3)
+    assert time.perf_counter() - started < 0.8
+    assert isinstance(results["slow"], TimeoutError)
+    assert isinstance(results["queued"], TimeoutError)
+
+    time.sleep(1.2)
+    assert not any(path.startswith("/queued") for path in server.requests)
+    assert isinstance(results["slow"], TimeoutError)   # a late reply does not change the result
+
+
+def test_budget_keeps_fast_results(server):
+    results = nasa_client.fetch_all({
+        "fast": lambda: nasa_client.get_json(f"{server.url}/fast", ttl=0),
+        "slow": lambda: nasa_client.get_json(f"{server.url}/slow", {"delay": 1.0}, ttl=0),
+    }, budget=0.3)
+    assert results["fast"] == {"path": "/fast"}
+    assert isinstance(results["slow"], TimeoutError)
@@ -0,0 +1,62 @@
+import time
+
+import nasa_client
+import ui_tasks
+
+
+class FakeWidget:
+    """Just enough of a Tk widget for TkTasks; after() callbacks run on demand."""
+
+    def __init__(self):
+        self.pending = []
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def after(self, ms, fn):
+        self.pending.append(fn)
+        return len(self.pending)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def run_after(self):
+        calls, self.pending = self.pending, []
+        for fn in calls:
+            fn()
+
+
+def test_blocking_task_does_not_starve_nasa_fetches(monkeypatch):
+    # A task that waits on fetch_all() must not occupy the pool fetch_all
+    # submits to; with a shared one-worker pool this times out.
+    monkeypatch.setattr(nasa_client, "MAX_WORKERS", 1)
+    nasa_client.close()
+    try:
+        widget = FakeWidget()
+        results = []
+        future = ui_tasks.TkTasks(widget).submit(
+            lambda: nasa_client.fetch_all({"a": lambda: 1, "b": lambda: 2}, budget=2),
+            results.append)
+        assert future.result(timeout=5) == {"a": 1, "b": 2}
+    finally:
+        nasa_client.close()
+
+    deadline = time.monotonic() + 2
+    while not results and time.monotonic() < deadline:
+        widget.run_after()
+    assert results == [{"a": 1, "b": 2}]
+
+
+def test_cancelled_group_results_are_dropped():
+    widget = FakeWidget()
+    tasks = ui_tasks.TkTasks(widget)
+    seen = []
+    future = tasks.submit(lambda: "old", seen.append, group="image")
+    future.result(timeout=5)
+    tasks.cancel("image")
+    tasks.submit(lambda: "new", seen.append, group="image").result(timeout=5)
+
+    deadline = time.monotonic() + 2
+    while tasks.pending() and time.monotonic() < deadline:
+        widget.run_after()
+    assert seen == ["new"]
@@ -0,0 +1,103 @@
+"""Background work for Tk windows.
+
+TkTasks runs callables on a small UI worker pool and hands their results
+back to the Tk thread by polling a queue with `after` (Tk must only be
+touched from its own thread). The pool is separate from nasa_client's fetch
+pool: tasks such as fetch_nasa_space_weather block on fetch_all(), and if
+they ran on the fetch pool they could fill it and starve their own requests. Tasks belong to a group; cancelling a group
+drops results that are still in flight, so a slow download for a previous
+image or step can never overwrite a newer one. Everything is cancelled when
+the owning widget is destroyed.
+"""
+import queue
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_MS = 50
+MAX_WORKERS = 4
+
+_executor = None
+_lock = threading.Lock()
+
+
+def executor():
+    """The UI task pool (created on first use)."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="ui-task")
+        return _executor
+
+
+class TkTasks:
+    def __init__(self, widget, poll_ms=POLL_MS):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._results = queue.Queue()
+        self._generation = defaultdict(int)
+        self._futures = defaultdict(set)
+        self._after_id = None
+        self._closed = False
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    def submit(self, fn, on_done, on_error=None, group=None):
+        """Run fn() in the background, then on_done(result) or on_error(exc) on the Tk thread."""
+        if self._closed:
+            return None
+        generation = self._generation[group]
+        future = executor().submit(fn)
+        self._futures[group].add(future)
+        future.add_done_callback(
+            lambda f: self._results.put((group, generation, f, on_done, on_error)))
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.poll_ms, self._poll)
+        return future
+
+    def cancel(self, group=None):
+        """Forget every task of `group`: queued ones never start, running ones are ignored."""
+        self._generation[group] += 1
+        for future in self._futures.pop(group, ()):
+            future.cancel()
+
+    def pending(self):
+        return sum(len(f) for f in self._futures.values())
+
+    def close(self):
+        self._closed = True
+        for group in list(self._futures):
+            self.cancel(group)
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _on_destroy(self, event):
+        if event.widget is self.widget:
+            self.close()
+
+    def _poll(self):
+        self._after_id = None
+        if self._closed:
+            return
+        while True:
+            try:
+                group, generation, future, on_done, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._futures[group].discard(future)
+            if future.cancelled() or generation != self._generation[group]:
+                continue
+            error = future.exception()
+            if error is None:
+                on_done(future.result())
+            elif on_error is not None:
+                on_error(error)
+            else:
+                print(f"Background task failed: {error}")
+            if self._closed:
+                return
+        if self.pending():
+            self._after_id = self.widget.after(self.poll_ms, self._poll)